@@ -0,0 +1,5 @@
+from django import VERSION as DJANGO_VERSION
+from .batch import batch_allocation
+
+if DJANGO_VERSION < (3, 2):
+    default_app_config = "randomfields.apps.RandomFieldsConfig"
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+class RandomFieldsConfig(AppConfig):
+    name = "randomfields"
+    verbose_name = "Random fields"
+
+    def ready(self):
+        # the models backing `permutation` and `pool` are only registered
+        # when randomfields is installed.  randomfields.models does not
+        # import them so projects that only use the fields need not add it.
+        from .models import pool, sequence
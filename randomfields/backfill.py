@@ -0,0 +1,117 @@
+import time
+from django.db import connections, models, router
+from django.db.models import Case, Q, Value, When
+
+def get_empty_filter(field, empty_value=None):
+    """
+        returns a Q object matching the rows whose value of `field` has not
+        been set yet
+    """
+    if empty_value is not None:
+        return Q(**{field.attname: empty_value})
+    empty = Q(**{"%s__isnull" % field.attname: True})
+    if isinstance(field, (models.CharField, models.TextField)):
+        empty |= Q(**{field.attname: ""})
+    return empty
+
+# rounds in a row that find no free value before generate_values() gives up
+max_empty_rounds = 10
+
+def generate_values(field, queryset, count):
+    """
+        returns a list of `count` distinct values of `field` that are not
+        taken in `queryset`.  raises ValueError if no free values are found,
+        such as when the current time bucket of a time sorted field is full.
+    """
+    values = set()
+    empty_rounds = 0
+    while len(values) < count:
+        needed = count - len(values)
+        candidates = set()
+        # random() may draw from fewer values than are needed
+        for _ in range(10 * needed):
+            if len(candidates) == needed:
+                break
+            candidate = field.random()
+            if candidate not in values:
+                candidates.add(candidate)
+        taken = queryset.filter(**{"%s__in" % field.attname: candidates}).values_list(field.attname, flat=True)
+        free = candidates.difference(taken)
+        values.update(free)
+        empty_rounds = 0 if free else empty_rounds + 1
+        if max_empty_rounds <= empty_rounds:
+            raise ValueError("Only %d of %d free values of '%s' were found.  The keyspace or its current time bucket is full." % (
+                len(values), count, field.attname))
+    return list(values)
+
+def update_values(model_cls, field, values, using):
+    """
+        writes the dict of primary keys to values in a single UPDATE
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(model_cls._meta.db_table)
+        pk_column = connection.ops.quote_name(model_cls._meta.pk.column)
+        column = connection.ops.quote_name(field.column)
+        params = []
+        for pk, value in values.items():
+            params.append(model_cls._meta.pk.get_db_prep_value(pk, connection))
+            params.append(field.get_db_prep_value(value, connection))
+        sql = "UPDATE %s SET %s = CAST(v.value AS %s) FROM (VALUES %s) AS v(pk, value) WHERE %s.%s = CAST(v.pk AS %s)" % (
+            table, column, field.db_type(connection),
+            ", ".join(["(%s, %s)"] * len(values)),
+            table, pk_column, model_cls._meta.pk.rel_db_type(connection),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+        return
+    model_cls._base_manager.using(using).filter(pk__in=list(values)).update(**{
+        field.attname: Case(
+            *[When(pk=pk, then=Value(value, output_field=field)) for pk, value in values.items()],
+            output_field=field
+        )
+    })
+
+def backfill(model_cls, field, chunk_size=1000, using=None, sleep=0, empty_value=None, callback=None):
+    """
+        sets unique random values of `field` on every row of `model_cls` that
+        has none, `chunk_size` rows at a time, and returns the number of rows
+        updated.
+
+        Rows are processed in primary key order and each chunk is written
+        with one UPDATE, so an interrupted backfill continues where it
+        stopped when it is run again.  `sleep` seconds are waited between
+        chunks.  `callback(done, total)` is called after each chunk.
+
+        `field` generates the values.  It may belong to a different model
+        class than `model_cls`, such as the historical model of a migration.
+    """
+    if not 0 < chunk_size:
+        raise ValueError("'chunk_size' must be a positive integer.")
+    using = using or router.db_for_write(model_cls)
+    queryset = model_cls._base_manager.using(using)
+    empty = get_empty_filter(field, empty_value)
+    pending = queryset.filter(empty).order_by("pk")
+
+    total = pending.count()
+    taken = queryset.exclude(empty).count()
+    if field.possibilities < taken + total:
+        raise ValueError("%d rows need a value but only %d of the %d possibilities of '%s' are free." % (
+            total, field.possibilities - taken, field.possibilities, field.attname))
+
+    done = 0
+    last_pk = None
+    while True:
+        chunk = pending if last_pk is None else pending.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            break
+        values = generate_values(field, queryset, len(pks))
+        update_values(model_cls, field, dict(zip(pks, values)), using)
+        last_pk = pks[-1]
+        done += len(pks)
+        if callback is not None:
+            callback(done, total)
+        if sleep:
+            time.sleep(sleep)
+    return done
@@ -0,0 +1,49 @@
+import threading
+from contextlib import contextmanager
+
+_state = threading.local()
+
+class BatchAllocation(object):
+    """
+        Hands out values that were verified in bulk to the saves of a
+        `batch_allocation()` block.
+    """
+    def __init__(self, size):
+        if not 0 < size:
+            raise ValueError("'size' must be a positive integer.")
+        self.size = size
+        self.values = {}
+
+    def take(self, field, obj, using):
+        """
+            returns a free value of `field` for `obj` on the database `using`
+        """
+        key = (field.model, field.attname, using, field.get_scope(obj))
+        values = self.values.get(key)
+        while not values:
+            values = self.values[key] = field.find_available_values(obj.__class__, obj, using, self.size)
+        return values.pop()
+
+def get_batch_allocation():
+    """
+        returns the BatchAllocation of the current thread or None
+    """
+    return getattr(_state, "allocation", None)
+
+@contextmanager
+def batch_allocation(size=100):
+    """
+        Unique random fields saved in the block fetch free values `size` at a
+        time instead of counting and probing the table for every save.
+
+        Each save still runs in a savepoint, so a value that a concurrent
+        writer inserted since it was verified is retried with the next value
+        without breaking an enclosing transaction.
+    """
+    previous = get_batch_allocation()
+    # nested blocks share the values of the outer block
+    _state.allocation = previous or BatchAllocation(size)
+    try:
+        yield _state.allocation
+    finally:
+        _state.allocation = previous
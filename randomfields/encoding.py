@@ -0,0 +1,72 @@
+import base64
+from six import text_type
+
+base58_alphabet = text_type("123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz")
+base58_indexes = dict((c, i) for i, c in enumerate(base58_alphabet))
+
+def b32encode(value):
+    return base64.b32encode(value).rstrip(b"=").decode("ascii")
+
+def b32decode(value):
+    value = value.upper()
+    return base64.b32decode(value + "=" * (-len(value) % 8))
+
+def b58encode(value):
+    n = int.from_bytes(value, "big")
+    chars = []
+    while n:
+        n, i = divmod(n, 58)
+        chars.append(base58_alphabet[i])
+    # each leading zero byte is written as the zero digit
+    zeros = len(value) - len(value.lstrip(b"\0"))
+    return base58_alphabet[0] * zeros + text_type("").join(reversed(chars))
+
+def b58decode(value):
+    n = 0
+    for c in value:
+        try:
+            n = n * 58 + base58_indexes[c]
+        except KeyError:
+            raise ValueError("%r is not a base58 character" % c)
+    zeros = len(value) - len(value.lstrip(base58_alphabet[0]))
+    return b"\0" * zeros + n.to_bytes((n.bit_length() + 7) // 8, "big")
+
+def b64urlencode(value):
+    return base64.urlsafe_b64encode(value).rstrip(b"=").decode("ascii")
+
+def b64urldecode(value):
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+codecs = {
+    "base32": (b32encode, b32decode),
+    "base58": (b58encode, b58decode),
+    "base64url": (b64urlencode, b64urldecode),
+}
+
+def encode(value, encoding):
+    """
+        returns the text form of the bytes `value`
+    """
+    try:
+        encoder = codecs[encoding][0]
+    except KeyError:
+        raise ValueError("Unknown encoding %r.  Choose one of %s." % (encoding, ", ".join(sorted(codecs))))
+    return encoder(bytes(value))
+
+def decode(value, encoding):
+    """
+        returns the bytes for the text `value`.  only the text returned by
+        encode() is accepted, apart from the letter case of base32.
+    """
+    try:
+        decoder = codecs[encoding][1]
+    except KeyError:
+        raise ValueError("Unknown encoding %r.  Choose one of %s." % (encoding, ", ".join(sorted(codecs))))
+    value = text_type(value)
+    try:
+        result = decoder(value)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("%r is not valid %s: %s" % (value, encoding, e))
+    if encode(result, encoding) != (value.upper() if encoding == "base32" else value):
+        raise ValueError("%r is not valid %s" % (value, encoding))
+    return result
@@ -1 +1,2 @@
-from .string import *
\ No newline at end of file
+from .string import *
+from .binary import *
\ No newline at end of file
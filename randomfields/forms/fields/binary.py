@@ -0,0 +1,22 @@
+from django.core.exceptions import ValidationError
+from django.forms import CharField
+from ... import encoding as codecs
+
+class RandomBinaryField(CharField):
+    def __init__(self, *args, **kwargs):
+        self.encoding = kwargs.pop("encoding")
+        self.length = kwargs.pop("length")
+        super(RandomBinaryField, self).__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        value = super(RandomBinaryField, self).to_python(value)
+        if value in self.empty_values:
+            return value
+        try:
+            data = codecs.decode(value, self.encoding)
+        except ValueError:
+            raise ValidationError("Enter a valid %s value." % self.encoding, code="invalid")
+        if len(data) != self.length:
+            raise ValidationError("Enter a value of %d bytes." % self.length, code="invalid")
+        # return the canonical text
+        return codecs.encode(data, self.encoding)
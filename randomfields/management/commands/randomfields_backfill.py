@@ -0,0 +1,39 @@
+from timeit import default_timer
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from ...backfill import backfill
+
+class Command(BaseCommand):
+    help = "Sets unique random values on the rows of a model whose random field has no value yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("field", metavar="app_label.Model.field", help="Field to backfill.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of rows updated per query.")
+        parser.add_argument("--sleep", type=float, default=0, help="Seconds to wait between chunks.")
+        parser.add_argument("--database", default=None, help="Database to backfill.  Defaults to the database the router picks for writes.")
+        parser.add_argument("--empty-value", default=None, help="Value of the rows to backfill.  Defaults to NULL and, for text columns, the empty string.")
+
+    def handle(self, *args, **options):
+        try:
+            app_label, model_name, field_name = options["field"].split(".")
+            model_cls = apps.get_model(app_label, model_name)
+            field = model_cls._meta.get_field(field_name)
+        except (ValueError, LookupError, FieldDoesNotExist) as e:
+            raise CommandError("%r is not a field: %s" % (options["field"], e))
+        if not hasattr(field, "possibilities"):
+            raise CommandError("%s is not a random field." % options["field"])
+
+        start = default_timer()
+        def progress(done, total):
+            elapsed = default_timer() - start
+            self.stdout.write("%d/%d rows (%.1f%%), %.0f rows/s" % (done, total, 100.0 * done / total, done / elapsed if elapsed else 0))
+
+        empty_value = options["empty_value"]
+        if empty_value is not None:
+            empty_value = field.to_python(empty_value)
+        try:
+            done = backfill(model_cls, field, options["chunk_size"], options["database"], options["sleep"], empty_value, progress)
+        except ValueError as e:
+            raise CommandError(e)
+        self.stdout.write("Backfilled %d rows of %s." % (done, options["field"]))
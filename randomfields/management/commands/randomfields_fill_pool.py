@@ -0,0 +1,89 @@
+import time
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, router, transaction
+from six import text_type
+from ...checks import DJANGO_VERSION_LT_22
+from ...models.pool import PooledValue, get_value_hash
+
+class Command(BaseCommand):
+    help = "Fills the pools of random fields with 'pool=True' with free values."
+
+    # batches in a row that add nothing before a pool is considered complete
+    max_empty_batches = 10
+
+    def add_arguments(self, parser):
+        parser.add_argument("fields", nargs="*", metavar="app_label.Model.field", help="Fields to fill.  Defaults to every field with 'pool=True'.")
+        parser.add_argument("--size", type=int, default=1000, help="Number of values to keep in each pool.")
+        parser.add_argument("--database", default=None, help="Database to fill the pools of.  Defaults to the database the router picks for writes.")
+        parser.add_argument("--interval", type=float, default=0, help="Keep filling the pools every INTERVAL seconds.")
+
+    def handle(self, *args, **options):
+        fields = self.get_fields(options["fields"])
+        while True:
+            for field in fields:
+                self.fill(field, options["size"], options["database"])
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
+
+    def get_fields(self, labels):
+        if not labels:
+            return [field for model in apps.get_models() for field in model._meta.local_fields if getattr(field, "pool", False)]
+        fields = []
+        for label in labels:
+            try:
+                app_label, model_name, field_name = label.split(".")
+                field = apps.get_model(app_label, model_name)._meta.get_field(field_name)
+            except (ValueError, LookupError, FieldDoesNotExist) as e:
+                raise CommandError("%r is not a field: %s" % (label, e))
+            if not getattr(field, "pool", False):
+                raise CommandError("%s does not use 'pool'." % label)
+            fields.append(field)
+        return fields
+
+    def fill(self, field, size, using=None):
+        """
+            adds free values to the pool of `field` until it holds `size`
+            values and returns the number of values added
+        """
+        model_cls = field.model
+        using = using or router.db_for_write(model_cls)
+        name = field.sequence_name
+        pool = PooledValue.objects.db_manager(using)
+        start = depth = pool.depth(name, using)
+        empty_batches = 0
+        while depth < size and empty_batches < self.max_empty_batches:
+            values = set(text_type(value) for value in field.find_available_values(model_cls, using=using))
+            # values that are free in the table may already be pooled
+            hashes = [get_value_hash(value) for value in values]
+            values.difference_update(pool.filter(name=name, value_hash__in=hashes).values_list("value", flat=True))
+            values = sorted(values)[:size - depth]
+            self.add_values(pool, name, values, using)
+            empty_batches = 0 if values else empty_batches + 1
+            depth = pool.depth(name, using)
+
+        message = "Pool of %s on '%s': %d values added, %d values pooled." % (name, using, depth - start, depth)
+        if depth < size:
+            message += "  The free values are exhausted."
+        field.logger.info(message)
+        self.stdout.write(message)
+        return depth - start
+
+    def add_values(self, pool, name, values, using):
+        """
+            adds `values` to the named pool.  values that a concurrent fill
+            added first are skipped.
+        """
+        if not DJANGO_VERSION_LT_22:
+            # bulk_create() does not call save(), which sets the hash
+            pool.bulk_create([PooledValue(name=name, value=value, value_hash=get_value_hash(value)) for value in values], ignore_conflicts=True)
+            return
+        # backwards compatibility Django < 2.2 without ignore_conflicts
+        for value in values:
+            try:
+                with transaction.atomic(using=using):
+                    pool.create(name=name, value=value)
+            except IntegrityError:
+                pass
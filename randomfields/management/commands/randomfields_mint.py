@@ -0,0 +1,85 @@
+import csv
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+from six import text_type
+from ...minting import default_chunk_size, mint
+
+class Command(BaseCommand):
+    help = (
+        "Generates unique random values of a field that are not in its table yet, "
+        "such as codes to print, and writes them to a CSV file or inserts them as new rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("field", metavar="app_label.Model.field", help="Field to mint values of.")
+        # not required=True, call_command() of Django < 2.0 does not pass
+        # keyword options to the parser
+        parser.add_argument("--count", type=int, default=None, help="Number of values to mint.  Required.")
+        parser.add_argument("--output", default=None, help="CSV file to write the values to, or - for stdout.")
+        parser.add_argument("--insert", action="store_true", help="Insert a row with each value instead of writing a CSV file.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per INSERT with --insert.")
+        parser.add_argument("--workers", type=int, default=None, help="Number of processes generating values.  Defaults to the number of CPUs.")
+        parser.add_argument("--chunk-size", type=int, default=default_chunk_size, help="Number of values each process sorts in memory.")
+        parser.add_argument("--database", default=None, help="Database to check and insert into.  Defaults to the database the router picks for writes.")
+        parser.add_argument("--tmpdir", default=None, help="Directory for the temporary files.  Needs room for about twice the minted values.")
+
+    def handle(self, *args, **options):
+        try:
+            app_label, model_name, field_name = options["field"].split(".")
+            model_cls = apps.get_model(app_label, model_name)
+            field = model_cls._meta.get_field(field_name)
+        except (ValueError, LookupError, FieldDoesNotExist) as e:
+            raise CommandError("%r is not a field: %s" % (options["field"], e))
+        if not hasattr(field, "possibilities"):
+            raise CommandError("%s is not a random field." % options["field"])
+        if not isinstance(field.random(), text_type):
+            raise CommandError("%s does not have text values." % options["field"])
+        if options["count"] is None:
+            raise CommandError("--count is required.")
+        if options["insert"] == (options["output"] is not None):
+            raise CommandError("Use either --output or --insert.")
+
+        using = options["database"] or router.db_for_write(model_cls)
+        # progress goes to stderr when the values go to stdout
+        log = self.stderr if options["output"] == "-" else self.stdout
+        values = mint(
+            field, options["count"], options["workers"], options["chunk_size"], using, options["tmpdir"],
+            callback=lambda minted, count: log.write("%d/%d values minted" % (minted, count)),
+        )
+        try:
+            if options["insert"]:
+                written = self.insert(model_cls, field, values, options["batch_size"], using)
+            elif options["output"] == "-":
+                written = self.write_csv(field, values, self.stdout)
+            else:
+                with open(options["output"], "w", newline="", encoding="utf-8") as f:
+                    written = self.write_csv(field, values, f)
+        except ValueError as e:
+            raise CommandError(e)
+        log.write("Minted %d values of %s." % (written, options["field"]))
+
+    def write_csv(self, field, values, f):
+        writer = csv.writer(f)
+        writer.writerow([field.name])
+        written = 0
+        for value in values:
+            writer.writerow([value])
+            written += 1
+        return written
+
+    def insert(self, model_cls, field, values, batch_size, using):
+        manager = model_cls._base_manager.db_manager(using)
+        written = 0
+        batch = []
+        for value in values:
+            batch.append(model_cls(**{field.attname: field.to_python(value)}))
+            if len(batch) == batch_size:
+                manager.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            manager.bulk_create(batch)
+            written += len(batch)
+        return written
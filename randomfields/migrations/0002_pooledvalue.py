@@ -0,0 +1,25 @@
+# Generated by Django 3.1.14 on 2026-10-19 12:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('randomfields', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledValue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('value', models.TextField()),
+                ('value_hash', models.CharField(editable=False, max_length=40)),
+            ],
+            options={
+                'unique_together': {('name', 'value_hash')},
+            },
+        ),
+    ]
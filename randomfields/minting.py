@@ -0,0 +1,198 @@
+import heapq
+import io
+import multiprocessing
+import os
+import random as insecure_random
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from django.apps import apps
+from django.db import router
+from six import text_type
+from .checks import DJANGO_VERSION_LT_20
+
+# values are generated, sorted and spilled to disk in runs of this size
+default_chunk_size = 200000
+
+# field of the worker processes, see init_worker()
+worker_field = None
+
+def get_field(label):
+    app_label, model_name, field_name = label.split(".")
+    return apps.get_model(app_label, model_name)._meta.get_field(field_name)
+
+def init_worker(label):
+    global worker_field
+    if not apps.ready:
+        # workers that were not forked import the project again
+        import django
+        django.setup()
+    worker_field = get_field(label)
+
+def write_run(values, directory):
+    """
+        writes the distinct `values` sorted to a new file in `directory` and
+        returns its path and the number of values written
+    """
+    values = sorted(set(values))
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with io.open(fd, "w", encoding="utf-8") as f:
+        for value in values:
+            f.write(value)
+            f.write("\n")
+    return path, len(values)
+
+def read_run(path):
+    with io.open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line[:-1]
+
+def generate_run(count, directory, field=None, label=None):
+    """
+        writes a run of `count` random values of `field` or else of the
+        field of the worker.  workers that were started without
+        init_worker() look the field up by its `label`.
+    """
+    if label is not None:
+        init_worker(label)
+    field = field or worker_field
+    return write_run([text_type(field.random()) for _ in range(count)], directory)
+
+def get_taken_queryset(model_cls, field, scope=(), using=None):
+    """
+        returns a queryset of the rows whose values of `field` new values
+        in `scope` must not collide with
+    """
+    return field.get_scope_queryset(model_cls, scope, using).exclude(**{"%s__isnull" % field.attname: True})
+
+def spill_taken(model_cls, field, directory, chunk_size=default_chunk_size, using=None, scope=()):
+    """
+        writes the values of `field` stored in the table as sorted runs and
+        returns their paths.  the rows are read with a server-side cursor
+        where the database supports it.
+    """
+    values = get_taken_queryset(model_cls, field, scope, using).values_list(field.attname, flat=True).order_by()
+    if DJANGO_VERSION_LT_20:
+        # backwards compatibility Django < 2.0 has no chunk_size
+        values = values.iterator()
+    else:
+        values = values.iterator(chunk_size=min(chunk_size, 10000))
+    paths = []
+    chunk = []
+    for value in values:
+        chunk.append(text_type(value))
+        if len(chunk) == chunk_size:
+            paths.append(write_run(chunk, directory)[0])
+            chunk = []
+    if chunk:
+        paths.append(write_run(chunk, directory)[0])
+    return paths
+
+def merge_runs(taken_paths, paths, directory):
+    """
+        merges the runs of `paths` into one sorted run without duplicates or
+        values of the runs of `taken_paths` and returns its path and the
+        number of values written
+    """
+    # taken values sort before equal candidates
+    streams = [((value, 0) for value in read_run(path)) for path in taken_paths]
+    streams.extend(((value, 1) for value in read_run(path)) for path in paths)
+    fd, merged = tempfile.mkstemp(suffix=".run", dir=directory)
+    count = 0
+    with io.open(fd, "w", encoding="utf-8") as f:
+        for value, group in groupby(heapq.merge(*streams), key=lambda item: item[0]):
+            if next(group)[1]:
+                f.write(value)
+                f.write("\n")
+                count += 1
+    for path in paths:
+        os.remove(path)
+    return merged, count
+
+def shuffle_run(path, count, chunk_size, directory):
+    """
+        yields the values of the run in random order.  each value goes to a
+        random bucket file and each bucket is shuffled in memory, which is a
+        uniform shuffle.
+    """
+    buckets = max(1, -(-count // chunk_size))
+    files = [tempfile.TemporaryFile("w+", encoding="utf-8", dir=directory) for _ in range(buckets)]
+    try:
+        # the order is not secret.  the values come from the field.
+        for value in read_run(path):
+            f = files[insecure_random.randrange(buckets)]
+            f.write(value)
+            f.write("\n")
+        for f in files:
+            f.seek(0)
+            values = [line[:-1] for line in f]
+            insecure_random.shuffle(values)
+            for value in values:
+                yield value
+    finally:
+        for f in files:
+            f.close()
+
+def mint(field, count, workers=None, chunk_size=default_chunk_size, using=None, directory=None, callback=None, scope=()):
+    """
+        yields `count` distinct values of `field` in random order that are
+        not stored in its table yet, or not in `scope` if the field is
+        unique together with other fields.
+
+        Values are generated in `workers` processes, or in this process if
+        `workers` is 1, and deduplicated with an external sort-merge in a
+        temporary directory, so memory use is bounded by `chunk_size` values
+        per process.  Values are text.  `callback(minted, count)` is called
+        after every round of generation.
+    """
+    if not 0 < count:
+        raise ValueError("'count' must be a positive integer.")
+    if not 0 < chunk_size:
+        raise ValueError("'chunk_size' must be a positive integer.")
+    model_cls = field.model
+    using = using or router.db_for_read(model_cls)
+    workers = workers or os.cpu_count() or 1
+    label = "%s.%s.%s" % (model_cls._meta.app_label, model_cls._meta.object_name, field.name)
+
+    # values may repeat across scopes, spill_taken() keeps each once
+    taken = get_taken_queryset(model_cls, field, scope, using).values(field.attname).order_by().distinct().count()
+    if field.possibilities < taken + count:
+        raise ValueError("%d values requested but at most %d of the %d possibilities of '%s' are free." % (
+            count, field.possibilities - taken, field.possibilities, field.attname))
+
+    directory = tempfile.mkdtemp(prefix="randomfields-mint-", dir=directory)
+    executor = None
+    try:
+        if 1 < workers:
+            if sys.version_info < (3, 7):
+                # backwards compatibility python < 3.7 has no mp_context or
+                # initializer, generate_run() looks the field up instead
+                executor = ProcessPoolExecutor(workers)
+            else:
+                context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+                executor = ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(label,))
+        taken_paths = spill_taken(model_cls, field, directory, chunk_size, using, scope)
+        minted_path, minted = write_run([], directory)
+        while minted < count:
+            needed = count - minted
+            sizes = [chunk_size] * (needed // chunk_size) + ([needed % chunk_size] if needed % chunk_size else [])
+            if executor is None:
+                runs = [generate_run(size, directory, field) for size in sizes]
+            elif sys.version_info < (3, 7):
+                runs = list(executor.map(generate_run, sizes, [directory] * len(sizes), [None] * len(sizes), [label] * len(sizes)))
+            else:
+                runs = list(executor.map(generate_run, sizes, [directory] * len(sizes)))
+            minted_path, minted = merge_runs(taken_paths, [minted_path] + [path for path, _ in runs], directory)
+            if callback is not None:
+                callback(minted, count)
+        if executor is not None:
+            executor.shutdown()
+            executor = None
+        for value in shuffle_run(minted_path, minted, chunk_size, directory):
+            yield value
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
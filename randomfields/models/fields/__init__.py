@@ -1,3 +1,4 @@
 from .base import *
+from .binary import *
 from .integer import *
 from .string import *
\ No newline at end of file
@@ -1,19 +1,129 @@
+import hashlib
+import hmac
 import logging
+import os
+import threading
+import time
+import weakref
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
 from django.core import checks
-from django.db import IntegrityError, transaction
-from django.db.utils import DatabaseError
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, router, transaction
+from collections import OrderedDict, deque
+from django.utils.encoding import force_bytes
+from django.utils.functional import cached_property
+from fractions import Fraction
 from math import log, ceil
-from ...random import urandom_available
+from ...batch import get_batch_allocation
+from ...permutation import Permutation
+from ... import random
+
+try:
+    from django.db.models import UniqueConstraint
+except ImportError:
+    # backwards compatibility Django < 2.2
+    UniqueConstraint = None
+
+# model class -> names of the attributes of the class and its bases
+model_attribute_names = weakref.WeakKeyDictionary()
+
+def get_model_attribute_names(model_cls):
+    """
+        returns the attribute names defined on `model_cls` and its bases.
+        computed once per model for the checks of all of its fields.
+    """
+    try:
+        return model_attribute_names[model_cls]
+    except KeyError:
+        names = model_attribute_names[model_cls] = frozenset(name for cls in model_cls.__mro__ for name in vars(cls))
+        return names
+
+class BoundedDict(OrderedDict):
+    """
+        A dict that keeps the `max_size` most recently used keys.  allocator
+        state is kept per database and scope, which may be one per tenant.
+    """
+    def __init__(self, max_size):
+        super(BoundedDict, self).__init__()
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return super(BoundedDict, self).__getitem__(key)
+
+    def pop(self, key, *args):
+        with self.lock:
+            return super(BoundedDict, self).pop(key, *args)
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            super(BoundedDict, self).__setitem__(key, value)
+            self.move_to_end(key)
+            while self.max_size < len(self):
+                self.popitem(last=False)
 
 class RandomFieldMixin(object):
     empty_strings_allowed = False
     logger = logging.getLogger("django.randomfields")
-    urandom_available = urandom_available
+    supports_permutation = False
+    # number of databases and scopes that allocator state is kept for
+    max_scopes = 1000
+
+    @property
+    def urandom_available(self):
+        return random.is_urandom_available()
 
     def __init__(self, *args, **kwargs):
         self.max_retry = kwargs.pop("max_retry", 3)
         self.alpha = kwargs.pop("alpha", 0.0001)
 
+        # Values are taken from a sequence and mapped through a keyed
+        # permutation of the keyspace instead of being checked for collisions.
+        # Each block of the sequence costs an UPDATE of its counter, so saves
+        # of values from a reserved block only INSERT.
+        self.permutation = kwargs.pop("permutation", False)
+        self.permutation_block_size = int(kwargs.pop("permutation_block_size", 100))
+        if self.permutation and not self.supports_permutation:
+            raise TypeError("%s does not support 'permutation'." % self.__class__.__name__)
+        if not 0 < self.permutation_block_size:
+            raise ValueError("'permutation_block_size' must be a positive integer.")
+        # allocator state that threads do not share, see next_sequence_value()
+        self._thread_state = threading.local()
+        # guards the rare updates of shared allocator state
+        self._state_lock = threading.Lock()
+
+        # Size candidate batches from a moving estimate of the collision rate
+        # seen by this process instead of counting the table for every insert.
+        self.adaptive_batches = kwargs.pop("adaptive_batches", False)
+        self._collision_estimates = BoundedDict(self.max_scopes)
+
+        # Values are claimed with cache.add() before they are saved so
+        # concurrent processes never insert the same value.
+        self.reservation_cache = kwargs.pop("reservation_cache", None)
+        self.reservation_timeout = kwargs.pop("reservation_timeout", 60)
+
+        # New values are claimed from a pool of free values that the
+        # randomfields_fill_pool command generates ahead of time.
+        self.pool = kwargs.pop("pool", False)
+        self.pool_metrics = {}
+
+        # Values are not checked before they are saved if a collision is less
+        # likely than `collision_risk` with `max_rows` rows.  The unique
+        # constraint and the retry in save() handle the rare collision.
+        # Disabled unless `collision_risk` is set.
+        self.collision_risk = kwargs.pop("collision_risk", getattr(settings, "RANDOMFIELDS_COLLISION_RISK", None))
+        self.max_rows = kwargs.pop("max_rows", 2 ** 32)
+        if not 0 < self.max_rows:
+            raise ValueError("'max_rows' must be a positive integer.")
+        if self.collision_risk is not None and not 0 <= self.collision_risk < 1:
+            raise ValueError("'collision_risk' must be at least 0 and less than 1.")
+
         # Default to the percent that causes us to generate 100 values.
         # This is roughly 91.2% full with an alpha of 0.0001.
         self.warn_at_percent = kwargs.pop("warn_at_percent", self.alpha ** (1.0 / 100))
@@ -26,19 +136,210 @@ class RandomFieldMixin(object):
 
         super(RandomFieldMixin, self).__init__(*args, **kwargs)
 
-    def find_available_values(self, model_cls):
-        if self.unique:
-            choices = set()
+        if self.pool and (self.permutation or not self.unique):
+            raise ValueError("'pool' requires a unique field without 'permutation'.")
+
+    @cached_property
+    def unique_scope(self):
+        """
+            returns a tuple of the other fields and the condition of the
+            narrowest unique_together or UniqueConstraint that includes the
+            field, or None if there is none.  only this one constraint is
+            used to check new values, unconditional ones are preferred.
+        """
+        opts = self.model._meta
+        scopes = [(names, None) for names in opts.unique_together]
+        for constraint in getattr(opts, "constraints", []):
+            if UniqueConstraint is not None and isinstance(constraint, UniqueConstraint) and constraint.fields:
+                scopes.append((constraint.fields, constraint.condition))
+        scopes = [scope for scope in scopes if self.name in scope[0]]
+        if not scopes:
+            return None
+        # an unconditional constraint applies to every row
+        names, condition = min(scopes, key=lambda scope: (scope[1] is not None, len(scope[0])))
+        return [opts.get_field(name) for name in names if name != self.name], condition
+
+    @property
+    def has_unique_constraint(self):
+        return self.unique or self.unique_scope is not None
+
+    def get_scope(self, obj):
+        """
+            returns the values of the other fields of the unique constraint
+            for `obj`.  the scope is empty if the field is unique on its own
+            or there is no instance.
+        """
+        if self.unique or self.unique_scope is None or obj is None:
+            return ()
+        return tuple(getattr(obj, field.attname) for field in self.unique_scope[0])
+
+    def get_scope_queryset(self, model_cls, scope=(), using=None):
+        """
+            returns a queryset of the rows that new values in `scope` must
+            not collide with.  the base manager is used so filters of the
+            default manager do not hide taken values.
+        """
+        queryset = model_cls._base_manager.using(using)
+        if scope:
+            fields, condition = self.unique_scope
+            queryset = queryset.filter(**dict((field.attname, value) for field, value in zip(fields, scope)))
+            if condition is not None:
+                queryset = queryset.filter(condition)
+        return queryset
+
+    def get_occupancy(self, model_cls, scope=(), using=None):
+        """
+            returns a tuple of the number of taken values and the number of
+            possibilities in the keyspace that random() currently draws from
+        """
+        return self.get_scope_queryset(model_cls, scope, using).count(), self.possibilities
+
+    @property
+    def collision_possibilities(self):
+        """
+            the number of possibilities new values collide with
+        """
+        return self.possibilities
+
+    @property
+    def skips_collision_checks(self):
+        """
+            True if the chance that a new value collides stays below
+            `collision_risk` even with `max_rows` rows
+        """
+        if not self.collision_risk:
+            return False
+        # logarithms of integers do not overflow
+        return log(self.max_rows) - log(self.collision_possibilities) <= log(self.collision_risk)
+
+    def get_occupancy_database(self, model_cls, obj, using):
+        """
+            returns the database to count the taken values of `using` on.
+            the count is only an estimate so it may come from a replica.
+        """
+        if using == router.db_for_write(model_cls, instance=obj):
+            return router.db_for_read(model_cls, instance=obj)
+        # the replicas of a database the router did not pick are unknown
+        return using
+
+    @property
+    def sequence_name(self):
+        return "%s.%s" % (self.model._meta.label_lower, self.name)
+
+    @cached_property
+    def index_permutation(self):
+        key = getattr(settings, "RANDOMFIELDS_PERMUTATION_KEY", None)
+        if not key:
+            raise ImproperlyConfigured("RANDOMFIELDS_PERMUTATION_KEY must be set to use 'permutation'.")
+        # each field gets its own permutation
+        field_key = hmac.new(force_bytes(key), force_bytes(self.sequence_name), hashlib.sha256).digest()
+        return Permutation(field_key, self.possibilities)
+
+    def next_sequence_value(self, model_cls, using=None):
+        """
+            returns the next value of the field's sequence.  values are
+            reserved in blocks of `permutation_block_size` per thread.
+        """
+        from ..sequence import Sequence
+        using = using or router.db_for_write(model_cls)
+        # forked children must not continue the blocks of their parent
+        key = (os.getpid(), using)
+        blocks = self._sequence_blocks
+        block = blocks.get(key)
+        if block is None or not block[0] or self.sequence_block_rolled_back(block, using):
+            values = Sequence.objects.reserve_block(self.sequence_name, self.permutation_block_size, using=using)
+            block = blocks[key] = [deque(values), None]
+            if Sequence.objects.is_transactional(using) and transaction.get_connection(using).in_atomic_block:
+                # the block is only ours once the reservation commits
+                def commit():
+                    block[1] = None
+                block[1] = commit
+                transaction.on_commit(commit, using=using)
+        return block[0].popleft()
+
+    def sequence_block_rolled_back(self, block, using):
+        """
+            returns True if the reservation of `block` was rolled back, so
+            another process may reserve the same values
+        """
+        commit = block[1]
+        if commit is None:
+            return False
+        # rolling back a transaction or savepoint discards its callbacks
+        return not any(callback[1] is commit for callback in transaction.get_connection(using).run_on_commit)
+
+    @property
+    def _sequence_blocks(self):
+        # each thread reserves its own blocks so threads never wait for each
+        # other or for the query of another thread
+        try:
+            return self._thread_state.sequence_blocks
+        except AttributeError:
+            blocks = self._thread_state.sequence_blocks = {}
+            return blocks
+
+    def value_from_index(self, index):
+        """
+            method returns the value at `index` in [0, possibilities)
+        """
+        raise NotImplementedError("value_from_index() must be implemented by subclasses that support permutation.")
+
+    collision_rate_weight = 0.1
+    # upper bound of the candidates generated and probed in one query.  a
+    # crowded keyspace takes several rounds instead of one huge batch.
+    max_candidates = 10000
 
-            # ensure unique values are available
-            t = model_cls.objects.count()# count of taken possibilities
-            if t == self.possibilities:
+    def observe_collisions(self, collisions, candidates, key):
+        """
+            updates the collision rate estimate of `adaptive_batches` for the
+            database and scope `key` with `collisions` out of `candidates`
+            values being taken
+        """
+        estimate = self._collision_estimates.get(key)
+        if estimate is not None:
+            # threads may overwrite each other's update of the moving average.
+            # that only delays it, so no lock is taken.
+            estimate[0] += self.collision_rate_weight * (float(collisions) / candidates - estimate[0])
+
+    def find_available_values(self, model_cls, obj=None, using=None, size=1):
+        using = using or router.db_for_write(model_cls, instance=obj)
+        scope = self.get_scope(obj)
+        # allocator state is kept per database
+        key = (using, scope)
+        if self.permutation:
+            # unique by construction
+            index = self.next_sequence_value(model_cls, using)
+            if self.possibilities <= index:
                 raise IntegrityError("All possibilities for field '%s' on %r are taken." % (self.attname, model_cls))
+            available_values = set([self.value_from_index(self.index_permutation.permute(index))])
+        elif self.has_unique_constraint and self.skips_collision_checks:
+            # a collision is negligible, save() retries it
+            available_values = set([self.random()])
+        elif self.unique or self.unique_scope is not None and None not in scope:
+            choices = set()
+
+            estimate = self._collision_estimates.get(key)
+            if estimate is not None and 1 <= estimate[0]:
+                # only a count proves that the keyspace is full
+                estimate = None
+            if estimate is None:
+                # ensure unique values are available
+                t, possibilities = self.get_occupancy(model_cls, scope, self.get_occupancy_database(model_cls, obj, using))# count of taken possibilities
+                if t == possibilities:
+                    raise IntegrityError("All possibilities for field '%s' on %r are taken." % (self.attname, model_cls))
+
+                # true division of the integers does not overflow for huge keyspaces
+                p = t / possibilities if t else 0.0# probability of collision
+                if self.adaptive_batches:
+                    self._collision_estimates[key] = [p, possibilities]
+            else:
+                p, possibilities = estimate
+                t = int(Fraction(p) * possibilities)
 
             # determine how many random values to generate
-            a = float(self.possibilities)# force float
-            p = 1 - ((a - t) / a)# probability of collision
-            if p:
+            if 1 <= p:
+                x = possibilities
+            elif p:
                 x = log(self.alpha) / log(p)
                 x = ceil(x)
                 x = int(x)
@@ -46,9 +347,9 @@ class RandomFieldMixin(object):
                 x = 1
 
             # warn if over full
-            percent_used = t / a
+            percent_used = p
             if self.warn_at_percent < percent_used:
-                remaining_choices = self.possibilities - t
+                remaining_choices = possibilities - t
                 self.logger.warning("%.2f%% of the choices for field '%s' on %r are taken.  There %s remaining." % (
                         percent_used * 100,
                         self.attname,
@@ -58,21 +359,30 @@ class RandomFieldMixin(object):
                 )
 
             # ensure we do not try to generate more values than possible
-            count = 1 + x
-            if self.possibilities < count:
-                count = self.possibilities
+            if size == 1:
+                count = 1 + x
+            else:
+                # enough candidates for `size` free values on average
+                count = x + int(ceil(size / (1 - p))) if p < 1 else possibilities
+            count = min(count, possibilities, max(self.max_candidates, size))
 
             while len(choices) < count:
-                choices.add(self.random())
+                choices.add(self.random_in_scope(scope))
 
-            unavailable_values = model_cls.objects.filter(
+            # probes must see every committed value so they go to the database written to
+            unavailable_values = self.get_scope_queryset(model_cls, scope, using).filter(
                 **{
                     "%s__in" % self.attname: choices
                 }
             ).values_list(self.attname, flat=True)
 
             available_values = choices.difference(unavailable_values)
+            self.observe_collisions(len(choices) - len(available_values), len(choices), key)
+            if not available_values:
+                # count the table again, it may be full
+                self._collision_estimates.pop(key, None)
         else:
+            # not unique or the scope contains NULL, which never collides
             available_values = set([self.random()])
 
         return available_values
@@ -84,20 +394,89 @@ class RandomFieldMixin(object):
     def persist_available_values(self, obj, available_values):
         setattr(obj, self.available_values_attname, available_values)
 
-    def get_available_values(self, obj):
+    def claim_pooled_value(self, obj, using=None):
+        """
+            returns a set with a value from the pool of the field or an
+            empty set if the pool is empty
+        """
+        from ..pool import PooledValue
+        using = using or router.db_for_write(obj.__class__, instance=obj)
+        value = PooledValue.objects.claim(self.sequence_name, using)
+        with self._state_lock:
+            metrics = self.pool_metrics.setdefault(using, {"hits": 0, "misses": 0})
+            metrics["misses" if value is None else "hits"] += 1
+        if value is None:
+            return set()
+        return set([self.to_python(value)])
+
+    def get_pool_metrics(self, using=None):
+        """
+            returns the hits and misses of claims from the pool of the field
+            on `using` in this process and the current depth of the pool
+        """
+        from ..pool import PooledValue
+        using = using or router.db_for_write(self.model)
+        metrics = dict(self.pool_metrics.get(using, {"hits": 0, "misses": 0}))
+        metrics["depth"] = PooledValue.objects.depth(self.sequence_name, using)
+        return metrics
+
+    @property
+    def uses_batch_allocation(self):
+        """
+            True if values are taken from the active batch_allocation() block
+        """
+        return self.has_unique_constraint and not (self.permutation or self.pool) and get_batch_allocation() is not None
+
+    def get_available_values(self, obj, using=None):
         available_values = getattr(obj, self.available_values_attname, set())
+        if not available_values and self.pool:
+            # falls back to find_available_values() when the pool is empty
+            available_values = self.claim_pooled_value(obj, using)
+        if not available_values and self.uses_batch_allocation:
+            using = using or router.db_for_write(obj.__class__, instance=obj)
+            available_values = set([get_batch_allocation().take(self, obj, using)])
         while not available_values:
-            available_values = self.find_available_values(obj.__class__)
+            available_values = self.find_available_values(obj.__class__, obj, using)
         return available_values
 
-    def set_available_value(self, obj):
-        available_values = self.get_available_values(obj)
-        setattr(obj, self.attname, available_values.pop())
+    def set_available_value(self, obj, using=None):
+        available_values = self.get_available_values(obj, using)
+        value = available_values.pop()
+        retry = self.max_retry
+        while not self.reserve_value(obj, value, using):
+            # claimed by another process
+            if not available_values:
+                retry -= 1
+                if retry <= 0:
+                    raise IntegrityError("No value for field '%s' on %r could be reserved in %d attempts." % (
+                        self.attname, obj.__class__, self.max_retry))
+            self.persist_available_values(obj, available_values)
+            available_values = self.get_available_values(obj, using)
+            value = available_values.pop()
+        setattr(obj, self.attname, value)
         self.persist_available_values(obj, available_values)
 
+    def get_reservation_key(self, value, using, scope):
+        raw = "%s|%s|%r|%r" % (self.sequence_name, using, scope, value)
+        return "randomfields:reservation:%s" % hashlib.sha1(force_bytes(raw)).hexdigest()
+
+    def reserve_value(self, obj, value, using=None):
+        """
+            returns True if `value` was claimed in the `reservation_cache` for
+            `obj` or no reservation is needed
+        """
+        if self.reservation_cache is None or self.permutation or not self.has_unique_constraint:
+            return True
+        using = using or router.db_for_write(obj.__class__, instance=obj)
+        key = self.get_reservation_key(value, using, self.get_scope(obj))
+        return caches[self.reservation_cache].add(key, 1, self.reservation_timeout)
+
+    using_attname = "_randomfields_using"
+
     def pre_save(self, obj, add):
         if add and getattr(obj, self.attname) in (None, ""):
-            self.set_available_value(obj)
+            # the database passed to save() is set by save_wrapper
+            self.set_available_value(obj, getattr(obj, self.using_attname, None))
             return getattr(obj, self.attname)
         else:
             return super(RandomFieldMixin, self).pre_save(obj, add)
@@ -108,23 +487,37 @@ class RandomFieldMixin(object):
         def save_wrapper(obj, *args, **kwargs):
             retry = self.max_retry
             success = False
-            while retry and not success:
-                retry -= 1
-                try:
-                    with transaction.atomic():
-                        cls_save(obj, *args, **kwargs)
-                except IntegrityError:
-                    if not retry \
-                       or not ( self.unique and cls.objects.filter(**{self.attname: getattr(obj, self.attname)}).exists() ) \
-                       or not hasattr(obj, self.available_values_attname):
-                        raise
-                    self.set_available_value(obj)
-                else:
-                    success = True
-                    if hasattr(obj, self.available_values_attname):
-                        delattr(obj, self.available_values_attname)
+            # save(force_insert, force_update, using, update_fields)
+            using = kwargs.get("using") or (args[2] if 2 < len(args) else None) or router.db_for_write(cls, instance=obj)
+            setattr(obj, self.using_attname, using)
+            try:
+                while retry and not success:
+                    retry -= 1
+                    try:
+                        with transaction.atomic(using=using):
+                            cls_save(obj, *args, **kwargs)
+                    except IntegrityError:
+                        if not retry \
+                           or not ( self.has_unique_constraint and self.get_scope_queryset(cls, self.get_scope(obj), using).filter(**{self.attname: getattr(obj, self.attname)}).exists() ) \
+                           or not hasattr(obj, self.available_values_attname):
+                            raise
+                        self.observe_collisions(1, 1, (using, self.get_scope(obj)))
+                        self.set_available_value(obj, using)
+                    else:
+                        success = True
+                        if hasattr(obj, self.available_values_attname):
+                            delattr(obj, self.available_values_attname)
+            finally:
+                if hasattr(obj, self.using_attname):
+                    delattr(obj, self.using_attname)
         cls.save = save_wrapper
 
+    def random_in_scope(self, scope):
+        """
+            returns a random value for new values in `scope`
+        """
+        return self.random()
+
     def random(self):
         """
             method returns a random value for the field
@@ -153,28 +546,38 @@ class RandomFieldMixin(object):
     def check(self, **kwargs):
         errors = super(RandomFieldMixin, self).check(**kwargs)
 
-        try:
-            instance = self.model()
-        except DatabaseError as e:
-            errors.append(checks.Warning(
-                (
-                 "Encountered database error while attempting to create an instance of model '%s'. "
-                 "This can occur for a number of reasons. One such reason is the model in question sets a default "
-                 "value that queries the database and migrations have not yet been run for the model. If you "
-                 "continue to see this warning, something is wrong. Otherwise it can be ignored. "
-                 "The actual error is as follows:\n\n\t%s\n"
-                ) % (self.model, e),
-                obj=self,
-                id='%s.RandomFieldMixin.InstanceDatabaseError' % __name__,
-            ))
-        else:
-            if hasattr(instance, self.available_values_attname):
+        attribute_names = get_model_attribute_names(self.model)
+        for attname in (self.available_values_attname, self.using_attname):
+            if attname in attribute_names:
                 errors.append(checks.Critical(
-                    'RandomFieldMixin uses the attribute "%s".  The model must not have this attribute.' % self.available_values_attname,
+                    'RandomFieldMixin uses the attribute "%s".  The model must not have this attribute.' % attname,
                     obj=self,
                     id='%s.RandomFieldMixin.MaskedAttr' % __name__,
                 ))
 
+        if self.permutation and not getattr(settings, "RANDOMFIELDS_PERMUTATION_KEY", None):
+            errors.append(checks.Critical(
+                "RANDOMFIELDS_PERMUTATION_KEY must be set to use 'permutation'.",
+                hint="Set it to a long random secret and never change it.  A different key maps the sequence to values that are already taken.",
+                obj=self,
+                id='%s.RandomFieldMixin.PermutationKeyMissing' % __name__,
+            ))
+
+        if (self.permutation or self.pool) and not apps.is_installed("randomfields"):
+            errors.append(checks.Critical(
+                "'permutation' and 'pool' store their state in tables of the randomfields app.",
+                hint="Add 'randomfields' to INSTALLED_APPS and run migrate.",
+                obj=self,
+                id='%s.RandomFieldMixin.AppNotInstalled' % __name__,
+            ))
+
+        if self.reservation_cache is not None and self.reservation_cache not in settings.CACHES:
+            errors.append(checks.Critical(
+                "The cache '%s' of 'reservation_cache' is not configured in CACHES." % self.reservation_cache,
+                obj=self,
+                id='%s.RandomFieldMixin.ReservationCacheMissing' % __name__,
+            ))
+
         if not self.urandom_available:
             errors.append(checks.Warning(
                 '''Cryptographically secure pseudo-random number generator "os.urandom" is not available. Using Python's insecure PRNG as a fallback.''',
@@ -182,3 +585,48 @@ class RandomFieldMixin(object):
                 id='%s.RandomFieldMixin.InsecurePRNG' % __name__,
             ))
         return errors
+
+class TimeSortedFieldMixin(object):
+    """
+        Prefixes random values with a coarse timestamp, similar to ULIDs, so
+        new values sort after older ones and inserts append to the end of the
+        index.  Values remain random within each time bucket of `resolution`
+        seconds since `epoch` and collision checks only count the current
+        bucket.
+
+        Subclasses set `buckets` and `bucket_possibilities` and implement
+        get_bucket_filter() and random().
+    """
+    default_resolution = 1
+    default_epoch = 1577836800# 2020-01-01 00:00:00 UTC
+    supports_permutation = False
+    buckets = None
+    bucket_possibilities = None
+
+    def __init__(self, *args, **kwargs):
+        self.resolution = kwargs.pop("resolution", self.default_resolution)
+        self.epoch = kwargs.pop("epoch", self.default_epoch)
+        if not 0 < self.resolution:
+            raise ValueError("'resolution' must be a positive number of seconds.")
+        super(TimeSortedFieldMixin, self).__init__(*args, **kwargs)
+
+    def current_bucket(self):
+        """
+            returns the time bucket for new values.  buckets wrap around
+            after `buckets` periods.
+        """
+        return int((time.time() - self.epoch) // self.resolution) % self.buckets
+
+    def get_bucket_filter(self, bucket):
+        """
+            returns a Q object matching the values of the time bucket
+        """
+        raise NotImplementedError("get_bucket_filter() must be implemented by subclasses.")
+
+    @property
+    def collision_possibilities(self):
+        return self.bucket_possibilities
+
+    def get_occupancy(self, model_cls, scope=(), using=None):
+        taken = self.get_scope_queryset(model_cls, scope, using).filter(self.get_bucket_filter(self.current_bucket())).count()
+        return taken, self.bucket_possibilities
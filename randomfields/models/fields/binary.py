@@ -0,0 +1,102 @@
+from django.db import models
+from six import binary_type, text_type
+from ... import encoding as codecs
+from ... import random
+from ...forms import RandomBinaryField as RandomBinaryFormField
+from .base import RandomFieldMixin
+
+class BinaryIdentifier(text_type):
+    """
+        The text form of a random binary value.  The raw bytes are
+        available as `db_value`.
+    """
+    db_value = None
+    encoding = None
+
+    def __new__(cls, value, encoding):
+        if isinstance(value, (binary_type, bytearray, memoryview)):
+            db_value = bytes(value)
+        else:
+            db_value = codecs.decode(value, encoding)
+
+        self = super(BinaryIdentifier, cls).__new__(cls, codecs.encode(db_value, encoding))
+        self.db_value = db_value
+        self.encoding = encoding
+
+        return self
+
+    def __getnewargs__(self):
+        return (
+            self.db_value,
+            self.encoding,
+        )
+
+    def __bytes__(self):
+        return self.db_value
+
+class RandomBinaryField(RandomFieldMixin, models.BinaryField):
+    """
+        Random bytes stored in a binary column.  `max_length` is the number
+        of bytes and `encoding` (base32, base58 or base64url) the text form
+        used for display and form input.
+    """
+    def __init__(self, *args, **kwargs):
+        try:
+            max_length = int(kwargs.pop("max_length"))
+        except KeyError:
+            raise TypeError("'max_length' is required")
+        if not 0 < max_length:
+            raise ValueError("'max_length' must be a positive integer.")
+
+        self.encoding = kwargs.pop("encoding", "base64url")
+        if self.encoding not in codecs.codecs:
+            raise ValueError("Unknown encoding %r.  Choose one of %s." % (self.encoding, ", ".join(sorted(codecs.codecs))))
+
+        kwargs.setdefault("editable", not kwargs.get("primary_key", False))
+
+        super(RandomBinaryField, self).__init__(*args, **kwargs)
+
+        # set after BinaryField.__init__() so it does not validate the
+        # length of the encoded text against the byte count
+        self.max_length = max_length
+        self.possibilities = 256 ** self.max_length
+
+    def db_type(self, connection):
+        # unique indexes require fixed width columns on these backends
+        if connection.vendor == "mysql":
+            return "binary(%d)" % self.max_length
+        if connection.vendor == "oracle":
+            return "RAW(%d)" % self.max_length
+        return super(RandomBinaryField, self).db_type(connection)
+
+    def random(self):
+        return BinaryIdentifier(random.randbytes(self.max_length), self.encoding)
+
+    def to_python(self, value):
+        if value is not None and not isinstance(value, BinaryIdentifier):
+            value = BinaryIdentifier(value, self.encoding)
+        return value
+
+    def from_db_value(self, value, *args):
+        return self.to_python(value)
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is not None:
+            value = self.to_python(value).db_value
+        return value
+
+    def value_to_string(self, obj):
+        value = self.value_from_object(obj)
+        if value is not None:
+            value = text_type(self.to_python(value))
+        return value
+
+    def formfield(self, **kwargs):
+        defaults = {
+            'form_class': RandomBinaryFormField,
+            'encoding': self.encoding,
+            'length': self.max_length,
+        }
+        defaults.update(kwargs)
+        return super(RandomBinaryField, self).formfield(**defaults)
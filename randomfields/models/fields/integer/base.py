@@ -1,11 +1,13 @@
 from django.core import checks
 from django.db import models
+from django.db.models import Q
 from .... import random
-from ..base import RandomFieldMixin
+from ..base import RandomFieldMixin, TimeSortedFieldMixin
 
 class RandomIntegerFieldMixin(RandomFieldMixin):
     lower_bound = None
     upper_bound = None
+    supports_permutation = True
     
     def __init__(self, *args, **kwargs):
         super(RandomIntegerFieldMixin, self).__init__(*args, **kwargs)
@@ -20,6 +22,9 @@ class RandomIntegerFieldMixin(RandomFieldMixin):
     def random(self):
         return random.randint(self.lower_bound, self.upper_bound)
     
+    def value_from_index(self, index):
+        return self.lower_bound + index
+    
     def formfield(self, **kwargs):
         defaults = {
             'min_value': self.lower_bound,
@@ -33,6 +38,33 @@ class RandomBigIntegerField(RandomIntegerFieldMixin, models.BigIntegerField):
     lower_bound = -9223372036854775808
     upper_bound = 9223372036854775807
 
+class RandomTimeSortedBigIntegerField(TimeSortedFieldMixin, RandomBigIntegerField):
+    """
+        A `RandomBigIntegerField` whose high `time_bits` bits hold the time
+        bucket and whose remaining bits are random.  The defaults give one
+        second buckets for 136 years with 2 ** 32 values each.
+    """
+    def __init__(self, *args, **kwargs):
+        self.time_bits = int(kwargs.pop("time_bits", 32))
+        super(RandomTimeSortedBigIntegerField, self).__init__(*args, **kwargs)
+        
+        total_bits = (self.possibilities - 1).bit_length()
+        if not 0 < self.time_bits < total_bits:
+            raise ValueError("'time_bits' must be between 1 and %d." % (total_bits - 1))
+        self.random_bits = total_bits - self.time_bits
+        self.buckets = 2 ** self.time_bits
+        self.bucket_possibilities = 2 ** self.random_bits
+    
+    def get_bucket_bounds(self, bucket):
+        lower_bound = self.lower_bound + (bucket << self.random_bits)
+        return lower_bound, lower_bound + self.bucket_possibilities - 1
+    
+    def get_bucket_filter(self, bucket):
+        return Q(**{"%s__range" % self.attname: self.get_bucket_bounds(bucket)})
+    
+    def random(self):
+        return random.randint(*self.get_bucket_bounds(self.current_bucket()))
+
 class RandomIntegerField(RandomIntegerFieldMixin, models.IntegerField):
     # 4 byte / 32 bit Integer
     lower_bound = -2147483648
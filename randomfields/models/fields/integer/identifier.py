@@ -6,6 +6,8 @@ from six import text_type, integer_types, string_types
 from itertools import chain
 from functools import total_ordering
 from ....checks import DJANGO_VERSION_LT_18
+from ...functions import IdentifierDisplay
+from ...lookups import IdentifierIn, IdentifierStartsWith, IdentifierIStartsWith
 from .base import RandomBigIntegerField, RandomIntegerField, RandomSmallIntegerField
 
 @total_ordering
@@ -107,6 +109,13 @@ class IntegerIdentifier(text_type):
         return hash(text_type("{};{}").format(int(self), self))
 
 class RandomIntegerIdentifierFieldMixin(object):
+    class_lookups = {
+        IdentifierDisplay.lookup_name: IdentifierDisplay,
+        IdentifierIn.lookup_name: IdentifierIn,
+        IdentifierStartsWith.lookup_name: IdentifierStartsWith,
+        IdentifierIStartsWith.lookup_name: IdentifierIStartsWith,
+    }
+    
     @cached_property
     def validators(self):
         '''
@@ -131,6 +140,31 @@ class RandomIntegerIdentifierFieldMixin(object):
             value = self.to_python(value).db_value
         return value
     
+    @cached_property
+    def discriminator(self):
+        # values below the discriminator are database values, see IntegerIdentifier.__new__()
+        return self.possibilities - abs(self.lower_bound)
+    
+    def get_prep_values(self, values):
+        """
+            batch version of get_prep_value() returning the distinct
+            database values without creating an IntegerIdentifier for each
+        """
+        possibilities = self.possibilities
+        discriminator = self.discriminator
+        prep_values = {}
+        for value in values:
+            if value is None:
+                continue
+            if isinstance(value, IntegerIdentifier):
+                value = value.db_value
+            else:
+                value = int(value)
+                if discriminator <= value:
+                    value -= possibilities
+            prep_values[value] = None
+        return list(prep_values)
+    
     def get_db_prep_value(self, *args, **kwargs):
         value = super(RandomIntegerIdentifierFieldMixin, self).get_db_prep_value(*args, **kwargs)
         if isinstance(value, IntegerIdentifier):
@@ -140,10 +174,67 @@ class RandomIntegerIdentifierFieldMixin(object):
     def from_db_value(self, value, *args):
         return self.to_python(value)
     
+    @cached_property
+    def display_width(self):
+        return len(text_type(self.possibilities + self.upper_bound))
+    
+    def display_to_db(self, value):
+        """
+            returns the database value for the display value or None if the
+            value is not a display value of this field
+        """
+        if isinstance(value, IntegerIdentifier):
+            return value.db_value
+        if isinstance(value, string_types) and not (value.isdigit() and len(value) <= self.display_width):
+            return None
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return None
+        if not self.lower_bound <= value - self.possibilities <= self.upper_bound:
+            return None
+        return value - self.possibilities
+    
+    def display_range_to_db(self, low, high):
+        """
+            returns the database values bounding the display values between
+            low and high inclusive or None if there are none
+        """
+        if isinstance(low, IntegerIdentifier):
+            low = low.display_value
+        if isinstance(high, IntegerIdentifier):
+            high = high.display_value
+        try:
+            low = self.lower_bound if low is None else max(int(low) - self.possibilities, self.lower_bound)
+            high = self.upper_bound if high is None else min(int(high) - self.possibilities, self.upper_bound)
+        except (TypeError, ValueError):
+            # not display values of this field
+            return None
+        if high < low:
+            return None
+        return low, high
+    
+    def display_prefix_to_db(self, prefix):
+        """
+            returns the database values bounding the display strings starting
+            with prefix or None if there are none
+        """
+        if not prefix:
+            return self.lower_bound, self.upper_bound
+        if not (prefix.isdigit() and len(prefix) <= self.display_width):
+            return None
+        scale = 10 ** (self.display_width - len(prefix))
+        low = int(prefix) * scale
+        return self.display_range_to_db(low, low + scale - 1)
+    
     def random(self):
         value = super(RandomIntegerIdentifierFieldMixin, self).random()
         return IntegerIdentifier(value, self.possibilities, self.lower_bound, self.upper_bound)
     
+    def value_from_index(self, index):
+        value = super(RandomIntegerIdentifierFieldMixin, self).value_from_index(index)
+        return IntegerIdentifier(value, self.possibilities, self.lower_bound, self.upper_bound)
+    
     def formfield(self, **kwargs):
         defaults = {
             'min_value': IntegerIdentifier(self.lower_bound, self.possibilities, self.lower_bound, self.upper_bound).display_value,
@@ -1,13 +1,22 @@
 from django.core import checks, validators
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.utils.functional import cached_property
+from itertools import chain
 from six import text_type, string_types
 from six.moves import range
 from ... import random
 from ...forms import RandomStringField as RandomStringFormField
-from .base import RandomFieldMixin
+from ..lookups import RandomStringExact, RandomStringIExact, RandomStringIn
+from .base import BoundedDict, RandomFieldMixin, TimeSortedFieldMixin
+from .integer import RandomBigIntegerField
 
 default_valid_chars = text_type("23456789BCDFGHJKMNPQRSTVWXZ")
 class RandomStringFieldMixin(RandomFieldMixin):
+    supports_permutation = True
+    supports_growth = True
+    
     def __init__(self, *args, **kwargs):
         try:
             max_length = int(kwargs["max_length"])
@@ -34,17 +43,190 @@ class RandomStringFieldMixin(RandomFieldMixin):
             raise TypeError("valid_chars must be of string type")
         self.valid_chars = text_type(valid_chars) 
         
+        # exact, iexact and in lookups normalize their values and match
+        # nothing without a query for values outside `valid_chars`.  off by
+        # default so rows stored before `valid_chars` changed are found.
+        self.strict_lookups = kwargs.pop("strict_lookups", False)
+        
+        # New values skip the shortest lengths once they are more than
+        # `grow_at_percent` full so the lengths still in use stay sparse.
+        # Each scope grows on its own.
+        self.grow_at_percent = kwargs.pop("grow_at_percent", None)
+        self._min_lengths = BoundedDict(self.max_scopes)
+        self._length_counts = BoundedDict(self.max_scopes)
+        
         super(RandomStringFieldMixin, self).__init__(*args, **kwargs)
         
+        if self.permutation and len(set(self.valid_chars)) != len(self.valid_chars):
+            raise ValueError("valid_chars must not contain duplicate characters when 'permutation' is used")
+        
+        if self.grow_at_percent is not None:
+            if not self.supports_growth:
+                raise TypeError("%s does not support 'grow_at_percent'." % self.__class__.__name__)
+            if self.permutation:
+                raise ValueError("'grow_at_percent' cannot be used with 'permutation'.")
+            if self.min_length == self.max_length:
+                raise ValueError("'grow_at_percent' requires 'min_length' to be less than 'max_length'.")
+            if not 0 < self.grow_at_percent < 1:
+                raise ValueError("'grow_at_percent' must be between 0 and 1.")
+        
         if self.min_length == self.max_length:
             self.possibilities = len(self.valid_chars) ** self.max_length
         else:
             vcl = len(self.valid_chars)
             self.possibilities = sum([vcl ** n for n in range(self.min_length, self.max_length+1)])
     
-    def random(self):
-        length = random.randint(self.min_length, self.max_length)
+    def random(self, min_length=None):
+        length = random.randint(self.min_length if min_length is None else min_length, self.max_length)
         return text_type("").join([random.choice(self.valid_chars) for _ in range(length)])
+    
+    def random_in_scope(self, scope):
+        if self.grow_at_percent is None:
+            return self.random()
+        return self.random(self.get_effective_min_length(scope))
+    
+    def get_effective_min_length(self, scope=()):
+        """
+            returns the length of the shortest new values in `scope`
+        """
+        return self._min_lengths.get(scope, self.min_length)
+    
+    @property
+    def collision_possibilities(self):
+        if self.grow_at_percent is None:
+            return super(RandomStringFieldMixin, self).collision_possibilities
+        # a scope may have grown to the longest values only
+        return len(self.valid_chars) ** self.max_length
+    
+    def get_length_counts(self, model_cls, length, scope=(), using=None):
+        """
+            returns a tuple of the number of values of `length` characters and
+            the number of shorter values
+        """
+        # two counts instead of one conditional aggregate, which Django 1.9
+        # cannot build over an annotation
+        queryset = self.get_scope_queryset(model_cls, scope, using).annotate(randomfields_length=Length(self.attname))
+        return queryset.filter(randomfields_length=length).count(), queryset.filter(randomfields_length__lt=length).count()
+    
+    def get_occupancy(self, model_cls, scope=(), using=None):
+        if self.grow_at_percent is None:
+            return super(RandomStringFieldMixin, self).get_occupancy(model_cls, scope, using)
+        
+        taken = self.get_scope_queryset(model_cls, scope, using).count()
+        vcl = len(self.valid_chars)
+        while True:
+            length = self.get_effective_min_length(scope)
+            limit = self.grow_at_percent * vcl ** length
+            # counting by length scans the table, so the values are only
+            # counted again once enough rows were added to reach the limit
+            counts = self._length_counts.get((using, scope))
+            if counts is None \
+               or length < self.max_length and limit <= counts[1] + taken - counts[0]:
+                counts = self._length_counts[(using, scope)] = (taken,) + self.get_length_counts(model_cls, length, scope, using)
+            if length == self.max_length or counts[1] < limit:
+                break
+            # the effective minimum only grows so values already handed out
+            # are never drawn from again.  threads that reach the limit
+            # together grow it once.
+            with self._state_lock:
+                if self.get_effective_min_length(scope) == length:
+                    self._min_lengths[scope] = length + 1
+                    self._length_counts.pop((using, scope), None)
+                    self.logger.info("Field '%s' on %r now draws values of %d to %d characters%s." % (
+                        self.attname, model_cls, length + 1, self.max_length, " in scope %r" % (scope,) if scope else ""))
+        
+        possibilities = sum([vcl ** n for n in range(self.get_effective_min_length(scope), self.max_length + 1)])
+        return taken - counts[2], possibilities
+    
+    @cached_property
+    def length_offsets(self):
+        """
+            maps each length to the index of its first value.  values are
+            indexed by length and then by position of their characters in
+            `valid_chars`.
+        """
+        vcl = len(self.valid_chars)
+        offsets = {}
+        offset = 0
+        for length in range(self.min_length, self.max_length + 1):
+            offsets[length] = offset
+            offset += vcl ** length
+        return offsets
+    
+    @cached_property
+    def char_indexes(self):
+        return dict((c, i) for i, c in enumerate(self.valid_chars))
+    
+    def value_from_index(self, index):
+        """
+            returns the value at `index` in [0, possibilities)
+        """
+        if not 0 <= index < self.possibilities:
+            raise ValueError("index must be in the range [0, %d)" % self.possibilities)
+        vcl = len(self.valid_chars)
+        for length in range(self.min_length, self.max_length + 1):
+            count = vcl ** length
+            if index < count:
+                break
+            index -= count
+        chars = []
+        for _ in range(length):
+            index, i = divmod(index, vcl)
+            chars.append(self.valid_chars[i])
+        return text_type("").join(reversed(chars))
+    
+    def index_from_value(self, value):
+        """
+            inverse of value_from_index()
+        """
+        try:
+            offset = self.length_offsets[len(value)]
+        except KeyError:
+            raise ValueError("%r is not between %d and %d characters long" % (value, self.min_length, self.max_length))
+        vcl = len(self.valid_chars)
+        char_indexes = self.char_indexes
+        index = 0
+        for c in value:
+            try:
+                index = index * vcl + char_indexes[c]
+            except KeyError:
+                raise ValueError("%r contains characters not in %r" % (value, self.valid_chars))
+        return offset + index
+    
+    @cached_property
+    def case_map(self):
+        """
+            maps the upper case form of each of `valid_chars` to the character
+            or is None if two of `valid_chars` only differ in case
+        """
+        case_map = dict((c.upper(), c) for c in self.valid_chars)
+        if len(case_map) != len(set(self.valid_chars)):
+            return None
+        return case_map
+    
+    def normalize_value(self, value, ignore_case=False):
+        """
+            returns `value` in the form the field stores it or None if no
+            value of the field can equal it.  with `ignore_case` letters are
+            converted to the case of `valid_chars` where that is unambiguous.
+        """
+        value = text_type(value)
+        if self.max_length < len(value):
+            return None
+        if ignore_case and self.case_map is not None:
+            chars = [self.case_map.get(c.upper()) for c in value]
+            if None in chars:
+                return None
+            return text_type("").join(chars)
+        if ignore_case:
+            valid_chars = set(c.upper() for c in self.valid_chars)
+            value_chars = set(c.upper() for c in value)
+        else:
+            valid_chars = set(self.valid_chars)
+            value_chars = set(value)
+        if not value_chars.issubset(valid_chars):
+            return None
+        return value
         
     def formfield(self, **kwargs):
         defaults = {
@@ -57,6 +239,12 @@ class RandomStringFieldMixin(RandomFieldMixin):
         return super(RandomStringFieldMixin, self).formfield(**defaults)
 
 class RandomCharField(RandomStringFieldMixin, models.CharField):
+    class_lookups = {
+        RandomStringExact.lookup_name: RandomStringExact,
+        RandomStringIExact.lookup_name: RandomStringIExact,
+        RandomStringIn.lookup_name: RandomStringIn,
+    }
+    
     def check(self, **kwargs):
         errors = super(RandomCharField, self).check(**kwargs)
         if 255 < self.max_length:
@@ -68,7 +256,107 @@ class RandomCharField(RandomStringFieldMixin, models.CharField):
             ))
         return errors
 
+class RandomTimeSortedCharField(TimeSortedFieldMixin, RandomCharField):
+    """
+        A `RandomCharField` whose first `time_length` characters hold the time
+        bucket written with the sorted `valid_chars`.  The remaining
+        characters are random.  The defaults give one minute buckets for 27
+        years with the default `valid_chars`.
+        
+        Values sort by time as long as the database collation orders
+        `valid_chars` the same way as Python does.
+    """
+    default_resolution = 60
+    supports_growth = False
+    
+    def __init__(self, *args, **kwargs):
+        self.time_length = int(kwargs.pop("time_length", 5))
+        super(RandomTimeSortedCharField, self).__init__(*args, **kwargs)
+        
+        if not 0 < self.time_length < self.min_length:
+            raise ValueError("'time_length' must be a positive integer less than 'min_length'.")
+        self.time_chars = text_type("").join(sorted(self.valid_chars))
+        vcl = len(self.valid_chars)
+        self.buckets = vcl ** self.time_length
+        self.bucket_possibilities = sum([vcl ** n for n in range(self.min_length - self.time_length, self.max_length - self.time_length + 1)])
+    
+    def get_bucket_prefix(self, bucket):
+        vcl = len(self.time_chars)
+        chars = []
+        for _ in range(self.time_length):
+            bucket, i = divmod(bucket, vcl)
+            chars.append(self.time_chars[i])
+        return text_type("").join(reversed(chars))
+    
+    def get_bucket_filter(self, bucket):
+        return Q(**{"%s__startswith" % self.attname: self.get_bucket_prefix(bucket)})
+    
+    def random(self):
+        prefix = self.get_bucket_prefix(self.current_bucket())
+        length = random.randint(self.min_length, self.max_length) - self.time_length
+        return prefix + text_type("").join([random.choice(self.valid_chars) for _ in range(length)])
+
 class RandomTextField(RandomStringFieldMixin, models.TextField):
+    class_lookups = dict(RandomCharField.class_lookups)
+    
     def __init__(self, *args, **kwargs):
         super(RandomTextField, self).__init__(*args, **kwargs)
-        self.validators.append(validators.MaxLengthValidator(self.max_length))
\ No newline at end of file
+        self.validators.append(validators.MaxLengthValidator(self.max_length))
+
+class RandomBigIntegerCharField(RandomStringFieldMixin, models.BigIntegerField):
+    """
+        A random string like `RandomCharField` that is stored in a BIGINT
+        column.  Each value is mapped to its index in the keyspace of
+        `valid_chars`, `min_length` and `max_length`, offset by the smallest
+        64 bit integer, so the keyspace may hold at most 2 ** 64 values.
+    """
+    lower_bound = RandomBigIntegerField.lower_bound
+    upper_bound = RandomBigIntegerField.upper_bound
+    # the column has no string length to count by
+    supports_growth = False
+    
+    def __init__(self, *args, **kwargs):
+        super(RandomBigIntegerCharField, self).__init__(*args, **kwargs)
+        if len(set(self.valid_chars)) != len(self.valid_chars):
+            raise ValueError("valid_chars must not contain duplicate characters")
+        if self.upper_bound - self.lower_bound + 1 < self.possibilities:
+            raise ValueError("%d possibilities do not fit into a 64 bit integer.  Reduce 'max_length' or 'valid_chars'." % self.possibilities)
+    
+    @cached_property
+    def validators(self):
+        # the integer range validators of BigIntegerField do not apply to the string value
+        return list(chain(self.default_validators, self._validators, [validators.MaxLengthValidator(self.max_length)]))
+    
+    def _check_max_length_warning(self):
+        # max_length is the length of the string value, not of the column
+        return []
+    
+    def to_python(self, value):
+        if value is None or isinstance(value, string_types):
+            return value
+        return self.value_from_index(int(value) - self.lower_bound)
+    
+    def from_db_value(self, value, *args):
+        return self.to_python(value)
+    
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return value
+        if not isinstance(value, string_types):
+            raise TypeError("Field '%s' expected a string but got %r." % (self.name, value))
+        try:
+            return self.lower_bound + self.index_from_value(value)
+        except ValueError as e:
+            raise ValueError("Field '%s' expected a valid value but got %r. %s" % (self.name, value, e))
+    
+    def formfield(self, **kwargs):
+        defaults = {
+            'max_length': self.max_length,
+            'min_length': self.min_length,
+            'valid_chars': self.valid_chars,
+            'form_class': RandomStringFormField,
+        }
+        defaults.update(kwargs)
+        # skip the integer form field defaults of BigIntegerField
+        return models.Field.formfield(self, **defaults)
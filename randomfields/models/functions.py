@@ -0,0 +1,68 @@
+from django.db.models import CharField, Transform
+from ..checks import DJANGO_VERSION_LT_20
+
+class IdentifierDisplay(Transform):
+    """
+        Returns the display string of an identifier field from the database.
+
+        The display value of an `IntegerIdentifier` is always
+        `db_value + possibilities`, zero filled to a fixed width.  The sum is
+        computed with a wider numeric type so the 64 bit field does not
+        overflow.
+
+        Usable as `IdentifierDisplay("id")` in annotations and ordering or as
+        the `display` transform: `filter(id__display__startswith="2147")`.
+    """
+    lookup_name = "display"
+    template = "LPAD(CAST(CAST(%(expressions)s AS NUMERIC(%(width)d)) + %(possibilities)d AS VARCHAR(%(width)d)), %(width)d, '0')"
+
+    # sqlite has no integer type wider than 64 bits, so the sum is carried
+    # out in two base 10**10 halves instead
+    sqlite_split = 10 ** 10
+
+    @property
+    def identifier_field(self):
+        field = self.lhs.output_field
+        while getattr(field, "remote_field", None) is not None:
+            field = field.target_field
+        if not hasattr(field, "display_width"):
+            raise TypeError("IdentifierDisplay requires an identifier field, got %r" % field)
+        return field
+
+    def _resolve_output_field(self):
+        output_field = CharField(max_length=self.identifier_field.display_width)
+        if DJANGO_VERSION_LT_20:
+            # backwards compatibility Django < 2.0 expects the method to set
+            # the field instead of returning it
+            self._output_field = output_field
+        return output_field
+
+    def as_sql(self, compiler, connection, **extra_context):
+        field = self.identifier_field
+        extra_context.setdefault("width", field.display_width)
+        extra_context.setdefault("possibilities", field.possibilities)
+        return super(IdentifierDisplay, self).as_sql(compiler, connection, **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template="LPAD(CAST(CAST(%(expressions)s AS DECIMAL(%(width)d)) + %(possibilities)d AS CHAR), %(width)d, '0')",
+            **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        field = self.identifier_field
+        lhs, lhs_params = compiler.compile(self.lhs)
+        m = self.sqlite_split
+        m_digits = len(str(m - 1))
+        high, low = divmod(field.possibilities, m)
+
+        # floor division of the column by m without leaving the 64 bit range
+        remainder = "((%s %%%% %d + %d) %%%% %d + %d)" % (lhs, m, m, m, low)
+        quotient = "((%s - %s %%%% %d) / %d - (%s %%%% %d < 0) + %d + %s / %d)" % (lhs, lhs, m, m, lhs, m, high, remainder, m)
+        digits = "%s || substr('%s' || (%s %%%% %d), -%d)" % (quotient, "0" * m_digits, remainder, m, m_digits)
+        sql = "substr('%s' || %s, -%d)" % ("0" * field.display_width, digits, field.display_width)
+
+        # the column is referenced once in each remainder and three more
+        # times in the quotient
+        return sql, list(lhs_params) * 5
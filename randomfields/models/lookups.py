@@ -0,0 +1,180 @@
+from django.db.models.lookups import Exact, IExact, In, IStartsWith, Range, StartsWith
+from django.db.models.sql.query import Query
+from six import string_types, text_type
+from .functions import IdentifierDisplay
+
+try:
+    from django.core.exceptions import EmptyResultSet
+except ImportError:
+    # backwards compatibility Django < 1.11
+    from django.db.models.sql.datastructures import EmptyResultSet
+
+class IdentifierDisplayLookupMixin(object):
+    """
+        Translates a predicate on the display string of an identifier field
+        into the equivalent predicate on the integer column so the query can
+        use the column's index.
+    """
+    def get_prep_lookup(self):
+        # display values are converted in get_db_lookup()
+        return self.rhs
+
+    def get_column_and_field(self):
+        if isinstance(self.lhs, IdentifierDisplay):
+            return self.lhs.lhs, self.lhs.identifier_field
+        return self.lhs, self.lhs.output_field
+
+    def get_db_lookup(self, column, field):
+        raise NotImplementedError("get_db_lookup() must be implemented by subclasses.")
+
+    def as_sql(self, compiler, connection):
+        if not self.rhs_is_direct_value():
+            return super(IdentifierDisplayLookupMixin, self).as_sql(compiler, connection)
+        column, field = self.get_column_and_field()
+        return compiler.compile(self.get_db_lookup(column, field))
+
+@IdentifierDisplay.register_lookup
+class IdentifierDisplayExact(IdentifierDisplayLookupMixin, Exact):
+    def get_db_lookup(self, column, field):
+        value = field.display_to_db(self.rhs)
+        if value is None:
+            raise EmptyResultSet
+        return field.get_lookup("exact")(column, value)
+
+@IdentifierDisplay.register_lookup
+class IdentifierDisplayIn(IdentifierDisplayLookupMixin, In):
+    def get_db_lookup(self, column, field):
+        values = set(field.display_to_db(value) for value in self.rhs)
+        values.discard(None)
+        if not values:
+            raise EmptyResultSet
+        return field.get_lookup("in")(column, sorted(values))
+
+@IdentifierDisplay.register_lookup
+class IdentifierDisplayRange(IdentifierDisplayLookupMixin, Range):
+    def get_db_lookup(self, column, field):
+        low, high = self.rhs
+        bounds = field.display_range_to_db(low, high)
+        if bounds is None:
+            raise EmptyResultSet
+        return field.get_lookup("range")(column, bounds)
+
+class IdentifierStartsWithMixin(IdentifierDisplayLookupMixin):
+    def get_db_lookup(self, column, field):
+        bounds = field.display_prefix_to_db(text_type(self.rhs))
+        if bounds is None:
+            raise EmptyResultSet
+        return field.get_lookup("range")(column, bounds)
+
+@IdentifierDisplay.register_lookup
+class IdentifierStartsWith(IdentifierStartsWithMixin, StartsWith):
+    pass
+
+@IdentifierDisplay.register_lookup
+class IdentifierIStartsWith(IdentifierStartsWithMixin, IStartsWith):
+    # display strings only contain digits
+    pass
+
+class IdentifierIn(In):
+    """
+        Converts every value of an `__in` lookup on an identifier field in one
+        pass using the field's precomputed bounds instead of creating an
+        `IntegerIdentifier` per value.  PostgreSQL receives the values as a
+        single array parameter.
+    """
+    def rhs_is_query(self):
+        # subqueries of Django < 2.0 have no resolve_expression()
+        return hasattr(self.rhs, "resolve_expression") or hasattr(self.rhs, "_prepare") or isinstance(self.rhs, Query)
+
+    def rhs_is_batchable(self):
+        if self.rhs_is_query():
+            return False
+        return self.rhs_is_direct_value() and not any(hasattr(value, "resolve_expression") for value in self.rhs)
+
+    def get_prep_lookup(self):
+        if self.rhs_is_query():
+            return super(IdentifierIn, self).get_prep_lookup()
+        self.rhs = list(self.rhs)
+        if not self.rhs_is_batchable():
+            return super(IdentifierIn, self).get_prep_lookup()
+        return self.lhs.output_field.get_prep_values(self.rhs)
+
+    def batch_process_rhs(self, compiler, connection, rhs=None):
+        if not self.rhs_is_batchable():
+            return super(IdentifierIn, self).batch_process_rhs(compiler, connection, rhs)
+        # the values were converted in get_prep_lookup()
+        values = list(self.rhs if rhs is None else rhs)
+        return ["%s"] * len(values), values
+
+    def process_rhs(self, compiler, connection):
+        if not self.rhs_is_batchable():
+            return super(IdentifierIn, self).process_rhs(compiler, connection)
+        if not self.rhs:
+            raise EmptyResultSet
+        return "(%s)" % ", ".join(["%s"] * len(self.rhs)), list(self.rhs)
+
+    def as_postgresql(self, compiler, connection):
+        # backends that limit the size of IN lists split them in as_sql()
+        if not self.rhs_is_batchable() or connection.ops.max_in_list_size():
+            return self.as_sql(compiler, connection)
+        if not self.rhs:
+            raise EmptyResultSet
+        lhs, params = self.process_lhs(compiler, connection)
+        params.append(list(self.rhs))
+        return "%s = ANY(%%s)" % lhs, params
+
+class RandomStringLookupMixin(object):
+    """
+        Brings the values of a lookup on a random string field with
+        `strict_lookups` into the form the field stores them in.  Values that
+        cannot be a value of the field match nothing without a query.
+    """
+    ignore_case = False
+
+    @property
+    def strict(self):
+        return getattr(self.lhs.output_field, "strict_lookups", False)
+
+    def normalize_rhs(self, value):
+        if not isinstance(value, string_types):
+            return value
+        return self.lhs.output_field.normalize_value(value, ignore_case=self.ignore_case)
+
+    def get_prep_lookup(self):
+        self.matches_nothing = False
+        if self.strict and self.rhs_is_direct_value():
+            value = self.normalize_rhs(self.rhs)
+            if value is None:
+                self.matches_nothing = True
+            else:
+                self.rhs = value
+        return super(RandomStringLookupMixin, self).get_prep_lookup()
+
+    def as_sql(self, compiler, connection):
+        if self.matches_nothing:
+            raise EmptyResultSet
+        return super(RandomStringLookupMixin, self).as_sql(compiler, connection)
+
+class RandomStringExact(RandomStringLookupMixin, Exact):
+    pass
+
+class RandomStringIExact(RandomStringLookupMixin, IExact):
+    ignore_case = True
+
+    def as_sql(self, compiler, connection):
+        if self.matches_nothing:
+            raise EmptyResultSet
+        if self.strict and self.rhs_is_direct_value() and self.lhs.output_field.case_map is not None:
+            # the value is in the case of the stored values, so the column's
+            # index can be used
+            return compiler.compile(Exact(self.lhs, self.rhs))
+        return super(RandomStringIExact, self).as_sql(compiler, connection)
+
+class RandomStringIn(RandomStringLookupMixin, In):
+    def get_prep_lookup(self):
+        self.matches_nothing = False
+        if self.strict and self.rhs_is_direct_value():
+            values = [self.normalize_rhs(value) for value in self.rhs]
+            self.rhs = [value for value in values if value is not None]
+            self.matches_nothing = not self.rhs
+        return super(RandomStringLookupMixin, self).get_prep_lookup()
@@ -0,0 +1,74 @@
+import hashlib
+from django.db import connections, models, router, transaction
+from django.utils.encoding import force_bytes
+
+def get_value_hash(value):
+    """
+        returns the hash that keeps pooled values unique.  text columns
+        cannot be part of a unique index on every database.
+    """
+    return hashlib.sha1(force_bytes(value)).hexdigest()
+
+class PooledValueManager(models.Manager):
+    def depth(self, name, using=None):
+        """
+            returns the number of values in the named pool
+        """
+        using = using or router.db_for_read(self.model)
+        return self.db_manager(using).filter(name=name).count()
+
+    def claim(self, name, using=None):
+        """
+            removes one value from the named pool and returns it or None if
+            the pool is empty.  concurrent callers never get the same value.
+        """
+        using = using or router.db_for_write(self.model)
+        connection = connections[using]
+        if connection.vendor == "postgresql":
+            return self._claim_returning(name, connection)
+        manager = self.db_manager(using)
+        with transaction.atomic(using=using):
+            queryset = manager.filter(name=name)
+            if getattr(connection.features, "has_select_for_update_skip_locked", False):
+                queryset = queryset.select_for_update(skip_locked=True)
+            while True:
+                row = queryset.values_list("pk", "value").first()
+                if row is None:
+                    return None
+                # the value belongs to whoever deletes it
+                if manager.filter(pk=row[0]).delete()[0]:
+                    return row[1]
+
+    def _claim_returning(self, name, connection):
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        sql = (
+            "DELETE FROM %(table)s WHERE id = ("
+            "SELECT id FROM %(table)s WHERE name = %%s LIMIT 1 FOR UPDATE SKIP LOCKED"
+            ") RETURNING value"
+        ) % {"table": table}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [name])
+            row = cursor.fetchone()
+        return None if row is None else row[0]
+
+class PooledValue(models.Model):
+    """
+        Free values generated ahead of time for random fields with
+        `pool=True`.  Values are stored as text of any length and are
+        unique per pool through their hash.
+    """
+    name = models.CharField(max_length=255)
+    value = models.TextField()
+    value_hash = models.CharField(max_length=40, editable=False)
+
+    objects = PooledValueManager()
+
+    class Meta:
+        unique_together = (("name", "value_hash"),)
+
+    def save(self, *args, **kwargs):
+        self.value_hash = get_value_hash(self.value)
+        super(PooledValue, self).save(*args, **kwargs)
+
+    def __str__(self):
+        return "%s=%s" % (self.name, self.value)
@@ -0,0 +1,89 @@
+import hashlib
+from django.db import DatabaseError, IntegrityError, connections, models, router, transaction
+from django.db.models import F
+from django.utils.encoding import force_bytes
+
+def get_database_sequence_name(name):
+    """
+        returns the name of the PostgreSQL sequence of the named sequence.
+        identifiers are limited to 63 characters.
+    """
+    return "randomfields_seq_%s" % hashlib.sha1(force_bytes(name)).hexdigest()[:32]
+
+class SequenceManager(models.Manager):
+    def is_transactional(self, using=None):
+        """
+            returns True if reserved values return to the sequence when the
+            transaction that reserved them rolls back
+        """
+        using = using or router.db_for_write(self.model)
+        return connections[using].vendor != "postgresql"
+
+    def reserve_block(self, name, count=1, using=None):
+        """
+            reserves `count` values of the named sequence and returns them.
+            on PostgreSQL they come from a database sequence, which does not
+            lock anything until the transaction ends, and may have gaps when
+            other connections reserve at the same time.  elsewhere they are
+            consecutive values of the Sequence table.
+        """
+        using = using or router.db_for_write(self.model)
+        if self.is_transactional(using):
+            start = self.reserve(name, count, using)
+            return list(range(start, start + count))
+        return self._reserve_nextval(name, count, connections[using])
+
+    def _reserve_nextval(self, name, count, connection):
+        sequence = get_database_sequence_name(name)
+        sql = "SELECT nextval(%s) FROM generate_series(1, %s)"
+        try:
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, [sequence, count])
+                    return [row[0] for row in cursor.fetchall()]
+        except DatabaseError:
+            # the sequence is created on first use
+            try:
+                with transaction.atomic(using=connection.alias):
+                    with connection.cursor() as cursor:
+                        cursor.execute("CREATE SEQUENCE %s MINVALUE 0 START 0" % connection.ops.quote_name(sequence))
+            except DatabaseError:
+                # created concurrently
+                pass
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [sequence, count])
+                return [row[0] for row in cursor.fetchall()]
+
+    def reserve(self, name, count=1, using=None):
+        """
+            reserves `count` consecutive values of the named sequence in the
+            Sequence table and returns the first one.  sequences start at 0.
+            the row stays locked until the current transaction ends.
+        """
+        using = using or router.db_for_write(self.model)
+        manager = self.db_manager(using)
+        with transaction.atomic(using=using):
+            # the update locks the row until the transaction ends
+            if not manager.filter(name=name).update(value=F("value") + count):
+                try:
+                    with transaction.atomic(using=using):
+                        manager.create(name=name, value=count)
+                except IntegrityError:
+                    # created concurrently
+                    manager.filter(name=name).update(value=F("value") + count)
+                else:
+                    return 0
+            return manager.filter(name=name).values_list("value", flat=True).get() - count
+
+class Sequence(models.Model):
+    """
+        Counter backing random fields with `permutation=True`.  Not used on
+        PostgreSQL, which has sequences.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    objects = SequenceManager()
+
+    def __str__(self):
+        return "%s=%d" % (self.name, self.value)
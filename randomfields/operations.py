@@ -0,0 +1,56 @@
+from django.apps import apps as global_apps
+from django.db.migrations.operations.base import Operation
+from .backfill import backfill
+
+class BackfillRandomField(Operation):
+    """
+        Sets unique random values on the existing rows of a model whose
+        random field has no value yet, in chunks of `chunk_size` rows.
+
+        Values are generated with the field of the current model because
+        the options of random fields are not part of the migration state.
+        Set `atomic = False` on the migration for large tables so each chunk
+        is committed on its own and an interrupted migration can resume.
+    """
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, model_name, name, chunk_size=1000, sleep=0, empty_value=None):
+        self.model_name = model_name
+        self.name = name
+        self.chunk_size = chunk_size
+        self.sleep = sleep
+        self.empty_value = empty_value
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "name": self.name,
+        }
+        if self.chunk_size != 1000:
+            kwargs["chunk_size"] = self.chunk_size
+        if self.sleep:
+            kwargs["sleep"] = self.sleep
+        if self.empty_value is not None:
+            kwargs["empty_value"] = self.empty_value
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model_cls = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model_cls):
+            return
+        try:
+            field = global_apps.get_model(app_label, self.model_name)._meta.get_field(self.name)
+        except LookupError:
+            # the model was removed since, fall back to the historical field
+            field = model_cls._meta.get_field(self.name)
+        backfill(model_cls, field, self.chunk_size, schema_editor.connection.alias, self.sleep, self.empty_value)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+    def describe(self):
+        return "Backfill random values of %s.%s" % (self.model_name, self.name)
@@ -0,0 +1,73 @@
+import hashlib
+import hmac
+from six import text_type
+
+class Permutation(object):
+    """
+        A keyed pseudo random permutation of the integers in [0, size).
+
+        A balanced Feistel network runs over the smallest even number of bits
+        that covers `size`.  Results outside of the domain are encrypted again
+        (cycle walking).  The network's domain is less than four times `size`,
+        so few values need more than one pass.
+    """
+    rounds = 8
+    digestmod = hashlib.sha256
+
+    def __init__(self, key, size):
+        if isinstance(key, text_type):
+            key = key.encode("utf-8")
+        size = int(size)
+        if not 0 < size:
+            raise ValueError("size must be a positive integer")
+
+        bits = max((size - 1).bit_length(), 2)
+        bits += bits % 2
+        half_bits = bits // 2
+        if 8 * self.digestmod().digest_size < half_bits:
+            raise ValueError("size is too large for the round function")
+
+        self.size = size
+        self.half_bits = half_bits
+        self.half_bytes = (half_bits + 7) // 8
+        self.mask = (1 << half_bits) - 1
+        self.round_macs = []
+        for i in range(self.rounds):
+            mac = hmac.new(key, digestmod=self.digestmod)
+            mac.update(("round %d;" % i).encode("ascii"))
+            self.round_macs.append(mac)
+
+    def _round(self, mac, value):
+        mac = mac.copy()
+        mac.update(value.to_bytes(self.half_bytes, "big"))
+        return int.from_bytes(mac.digest(), "big") & self.mask
+
+    def _encrypt(self, value):
+        left, right = value >> self.half_bits, value & self.mask
+        for mac in self.round_macs:
+            left, right = right, left ^ self._round(mac, right)
+        return (left << self.half_bits) | right
+
+    def _decrypt(self, value):
+        left, right = value >> self.half_bits, value & self.mask
+        for mac in reversed(self.round_macs):
+            left, right = right ^ self._round(mac, left), left
+        return (left << self.half_bits) | right
+
+    def _check(self, value):
+        if not 0 <= value < self.size:
+            raise ValueError("value must be in the range [0, %d)" % self.size)
+
+    def permute(self, value):
+        self._check(value)
+        value = self._encrypt(value)
+        while self.size <= value:
+            value = self._encrypt(value)
+        return value
+
+    def invert(self, value):
+        self._check(value)
+        value = self._decrypt(value)
+        while self.size <= value:
+            value = self._decrypt(value)
+        return value
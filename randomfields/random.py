@@ -2,25 +2,50 @@ from __future__ import absolute_import
 import logging
 import os
 import random as insecure_random
+import sys
 from django.conf import settings
 
 logger = logging.getLogger("django.randomfields.random")
 secure_random = insecure_random.SystemRandom()
 
-try:
-    os.urandom(1)
-except NotImplementedError:
-    urandom_available = False
-else:
-    urandom_available = True
+# os.urandom is probed and settings are read on first use so importing
+# this module does no work and does not require configured settings
+_urandom_available = None
+log_exceptions = None
 
-log_exceptions = urandom_available or "randomfields.models.fields.base.RandomFieldMixin.InsecurePRNG" not in settings.SILENCED_SYSTEM_CHECKS
+def is_urandom_available():
+    global _urandom_available, urandom_available
+    if _urandom_available is None:
+        try:
+            os.urandom(1)
+        except NotImplementedError:
+            _urandom_available = False
+        else:
+            _urandom_available = True
+        urandom_available = _urandom_available
+    return _urandom_available
+
+def get_log_exceptions():
+    global log_exceptions
+    if log_exceptions is None:
+        log_exceptions = is_urandom_available() or "randomfields.models.fields.base.RandomFieldMixin.InsecurePRNG" not in settings.SILENCED_SYSTEM_CHECKS
+    return log_exceptions
+
+def __getattr__(name):
+    # backwards compatibility for the module attribute set at import time
+    if name == "urandom_available":
+        return is_urandom_available()
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+if sys.version_info < (3, 7):
+    # module __getattr__ requires python 3.7, set the attribute at import
+    is_urandom_available()
 
 def randint(*args):
     try:
         return secure_random.randint(*args)
     except NotImplementedError:
-        if log_exceptions:
+        if get_log_exceptions():
             logger.exception("Encountered 'secure_random.randint' NotImplementedError. Falling back to 'insecure_random.randint'.")
     return insecure_random.randint(*args)
 
@@ -28,6 +53,14 @@ def choice(seq):
     try:
         return secure_random.choice(seq)
     except NotImplementedError:
-        if log_exceptions:
+        if get_log_exceptions():
             logger.exception("Encountered 'secure_random.choice' NotImplementedError. Falling back to 'insecure_random.choice'.")
-    return insecure_random.choice(seq)
\ No newline at end of file
+    return insecure_random.choice(seq)
+
+def randbytes(n):
+    try:
+        return os.urandom(n)
+    except NotImplementedError:
+        if get_log_exceptions():
+            logger.exception("Encountered 'os.urandom' NotImplementedError. Falling back to 'insecure_random.getrandbits'.")
+    return bytes(bytearray(insecure_random.getrandbits(8) for _ in range(n)))
\ No newline at end of file
@@ -1,8 +1,15 @@
 from django.db import models
-from randomfields.models.fields.string import RandomCharField
-from randomfields.models.fields.integer import NarrowPositiveIntegerField, RandomIntegerIdentifierField
+from randomfields.models.fields.binary import RandomBinaryField
+from randomfields.models.fields.string import RandomCharField, RandomTextField, RandomBigIntegerCharField, RandomTimeSortedCharField
+from randomfields.models.fields.integer import NarrowPositiveIntegerField, RandomBigIntegerField, RandomIntegerField, RandomTimeSortedBigIntegerField, RandomBigIntegerIdentifierField, RandomIntegerIdentifierField, RandomSmallIntegerIdentifierField
 from uuid import uuid4
 
+try:
+    from django.db.models import UniqueConstraint
+except ImportError:
+    # backwards compatibility Django < 2.2
+    UniqueConstraint = None
+
 def unique_related_name():
     return "r{}".format(uuid4().hex)
 
@@ -12,6 +19,9 @@ class TestPrimaryKey(models.Model):
 class TestUnique(models.Model):
     unique_field = RandomCharField(unique=True, max_length=10)
 
+class TestStrictLookups(models.Model):
+    code = RandomCharField(unique=True, max_length=10, strict_lookups=True)
+
 class TestNonUniqueIntegrityError(models.Model):
     unique_int_field = models.IntegerField(unique=True)
     non_unique_field = RandomCharField(max_length=10)
@@ -26,12 +36,108 @@ class TestMinLengthPossibilities(models.Model):
 class TestFixLengthPossibilities(models.Model):
     data = RandomCharField(unique=True, max_length=2, valid_chars="ab")
 
+class TestBigIntegerChar(models.Model):
+    data = RandomBigIntegerCharField(unique=True, max_length=8)
+
+class TestBigIntegerCharPossibilities(models.Model):
+    data = RandomBigIntegerCharField(unique=True, max_length=2, min_length=1, valid_chars="ab")
+
+class TestBinary(models.Model):
+    data = RandomBinaryField(unique=True, max_length=16)
+
+class TestBinaryBase32(models.Model):
+    data = RandomBinaryField(unique=True, max_length=5, encoding="base32")
+
+class TestTimeSortedBigInteger(models.Model):
+    id = RandomTimeSortedBigIntegerField(primary_key=True)
+
+class TestTimeSortedChar(models.Model):
+    data = RandomTimeSortedCharField(unique=True, max_length=10)
+
+class SmallRangeIntegerField(RandomIntegerField):
+    lower_bound = 1
+    upper_bound = 20
+
+class TestAdaptiveBatches(models.Model):
+    data = SmallRangeIntegerField(unique=True, adaptive_batches=True)
+
+class TestPermutationInteger(models.Model):
+    data = SmallRangeIntegerField(unique=True, permutation=True)
+
+class TestPermutationIdentifier(models.Model):
+    id = RandomIntegerIdentifierField(primary_key=True, permutation=True, permutation_block_size=10)
+
+class TestPermutationChar(models.Model):
+    data = RandomCharField(unique=True, max_length=2, min_length=1, valid_chars="ab", permutation=True)
+
+class TestGrowingChar(models.Model):
+    data = RandomCharField(unique=True, max_length=3, min_length=1, valid_chars="ab", grow_at_percent=0.5)
+
+class TestScopedChar(models.Model):
+    tenant = models.IntegerField(null=True)
+    code = RandomCharField(max_length=1, valid_chars="ab")
+
+    class Meta:
+        unique_together = (("tenant", "code"),)
+
+class TestScopedGrowingChar(models.Model):
+    tenant = models.IntegerField()
+    code = RandomCharField(max_length=3, min_length=1, valid_chars="ab", grow_at_percent=0.5)
+
+    class Meta:
+        unique_together = (("tenant", "code"),)
+
+class TestConditionalScopedChar(models.Model):
+    tenant = models.IntegerField()
+    active = models.BooleanField(default=True)
+    code = RandomCharField(max_length=1, valid_chars="ab")
+
+    class Meta:
+        if UniqueConstraint is not None:
+            constraints = [
+                UniqueConstraint(fields=["tenant", "code"], condition=models.Q(active=True), name="tests_active_tenant_code"),
+            ]
+
+class ActiveManager(models.Manager):
+    def get_queryset(self):
+        return super(ActiveManager, self).get_queryset().filter(deleted=False)
+
+class TestSoftDeleteChar(models.Model):
+    deleted = models.BooleanField(default=False)
+    data = RandomCharField(unique=True, max_length=1, valid_chars="ab")
+
+    objects = ActiveManager()
+
+class TestReservedChar(models.Model):
+    data = RandomCharField(unique=True, max_length=1, valid_chars="ab", reservation_cache="default")
+
+class TestPooledChar(models.Model):
+    data = RandomCharField(unique=True, max_length=2, valid_chars="ab", pool=True)
+
+class TestBackfillChar(models.Model):
+    data = RandomCharField(max_length=3, valid_chars="ab")
+
+class TestBackfillIdentifier(models.Model):
+    data = RandomBigIntegerIdentifierField()
+
+class TestUncheckedBigInteger(models.Model):
+    data = RandomBigIntegerField(unique=True, collision_risk=1e-9)
+
+class TestHugeText(models.Model):
+    data = RandomTextField(unique=True, max_length=300)
+
 class TestIdentifierValue(models.Model):
     id = RandomIntegerIdentifierField(primary_key=True, editable=True)
 
 class TestIdentifierData(models.Model):
     data = RandomIntegerIdentifierField()
 
+class TestBigIdentifierData(models.Model):
+    data = RandomBigIntegerIdentifierField(unique=True)
+
+class TestSmallIdentifierData(models.Model):
+    data = RandomSmallIntegerIdentifierField(unique=True)
+
 class TestIdentifierO2OValue(models.Model):
     id = models.OneToOneField(TestIdentifierValue, on_delete=models.CASCADE, primary_key=True, editable=True)
 
@@ -0,0 +1,98 @@
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from six import StringIO
+from unittest import skipUnless
+from randomfields.backfill import backfill, update_values
+from randomfields.models.fields import RandomTimeSortedCharField
+from randomfields.operations import BackfillRandomField
+from . import mock
+from .models import TestBackfillChar, TestBackfillIdentifier
+
+class BackfillTests(TestCase):
+    def setUp(self):
+        self.field = TestBackfillChar._meta.get_field("data")
+    
+    def create_empty(self, model_cls, count, empty_value=""):
+        model_cls.objects.bulk_create([model_cls() for _ in range(count)])
+        model_cls.objects.update(data=empty_value)
+    
+    def test_backfill(self):
+        self.create_empty(TestBackfillChar, 6)
+        progress = []
+        done = backfill(TestBackfillChar, self.field, chunk_size=4, callback=lambda *args: progress.append(args))
+        self.assertEqual(done, 6)
+        self.assertEqual(progress, [(4, 6), (6, 6)])
+        values = list(TestBackfillChar.objects.values_list("data", flat=True))
+        self.assertEqual(len(set(values)), 6)
+        self.assertNotIn("", values)
+    
+    def test_resume(self):
+        self.create_empty(TestBackfillChar, 6)
+        backfill(TestBackfillChar, self.field)
+        pks = list(TestBackfillChar.objects.values_list("pk", flat=True)[:2])
+        TestBackfillChar.objects.filter(pk__in=pks).update(data="")
+        
+        with mock.patch("randomfields.backfill.time.sleep") as sleep:
+            self.assertEqual(backfill(TestBackfillChar, self.field, chunk_size=1, sleep=0.5), 2)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(len(set(TestBackfillChar.objects.values_list("data", flat=True))), 6)
+    
+    def test_possibilities_exhausted(self):
+        self.create_empty(TestBackfillChar, 9)
+        with self.assertRaises(ValueError):
+            backfill(TestBackfillChar, self.field)
+    
+    def test_time_bucket_exhausted(self):
+        # two values per time bucket, four in all
+        field = RandomTimeSortedCharField(max_length=2, time_length=1, valid_chars="ab")
+        field.set_attributes_from_name("data")
+        self.create_empty(TestBackfillChar, 3)
+        with self.assertRaises(ValueError):
+            backfill(TestBackfillChar, field)
+    
+    @skipUnless(connection.vendor == "postgresql", "The UPDATE ... FROM (VALUES ...) statement is only used on PostgreSQL")
+    def test_update_values_postgresql(self):
+        self.create_empty(TestBackfillIdentifier, 3, 0)
+        field = TestBackfillIdentifier._meta.get_field("data")
+        pks = list(TestBackfillIdentifier.objects.values_list("pk", flat=True))
+        values = dict((pk, field.random()) for pk in pks)
+        with CaptureQueriesContext(connection) as context:
+            update_values(TestBackfillIdentifier, field, values, "default")
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn("FROM (VALUES", context.captured_queries[0]["sql"])
+        self.assertEqual(dict(TestBackfillIdentifier.objects.values_list("pk", "data")), values)
+    
+    def test_identifier(self):
+        self.create_empty(TestBackfillIdentifier, 5, 0)
+        field = TestBackfillIdentifier._meta.get_field("data")
+        self.assertEqual(backfill(TestBackfillIdentifier, field, chunk_size=2, empty_value=0), 5)
+        values = set(TestBackfillIdentifier.objects.values_list("data", flat=True))
+        self.assertEqual(len(values), 5)
+        self.assertNotIn(0, [value.db_value for value in values])
+    
+    def test_command(self):
+        self.create_empty(TestBackfillChar, 3)
+        out = StringIO()
+        call_command("randomfields_backfill", "tests.TestBackfillChar.data", chunk_size=2, stdout=out)
+        self.assertIn("3/3 rows", out.getvalue())
+        self.assertIn("Backfilled 3 rows", out.getvalue())
+        self.assertFalse(TestBackfillChar.objects.filter(data="").exists())
+        
+        with self.assertRaises(CommandError):
+            call_command("randomfields_backfill", "tests.TestBackfillChar.id", stdout=out)
+        self.create_empty(TestBackfillChar, 6)
+        with self.assertRaises(CommandError):
+            call_command("randomfields_backfill", "tests.TestBackfillChar.data", stdout=out)
+    
+    def test_operation(self):
+        self.create_empty(TestBackfillChar, 3)
+        operation = BackfillRandomField("TestBackfillChar", "data", chunk_size=2)
+        self.assertEqual(operation.deconstruct(), ("BackfillRandomField", [], {"model_name": "TestBackfillChar", "name": "data", "chunk_size": 2}))
+        state = ProjectState.from_apps(apps)
+        operation.database_forwards("tests", mock.Mock(connection=connection), state, state)
+        self.assertFalse(TestBackfillChar.objects.filter(data="").exists())
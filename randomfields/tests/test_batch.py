@@ -0,0 +1,68 @@
+import threading
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+import randomfields
+from randomfields.batch import BatchAllocation, get_batch_allocation
+from .models import TestMinLengthPossibilities, TestScopedChar, TestUnique
+
+class BatchAllocationTests(SimpleTestCase):
+    def test_size(self):
+        with self.assertRaises(ValueError):
+            BatchAllocation(0)
+    
+    def test_nesting(self):
+        self.assertIsNone(get_batch_allocation())
+        with randomfields.batch_allocation() as outer:
+            with randomfields.batch_allocation(10) as inner:
+                self.assertIs(inner, outer)
+            self.assertIs(get_batch_allocation(), outer)
+        self.assertIsNone(get_batch_allocation())
+    
+    def test_thread_local(self):
+        seen = []
+        with randomfields.batch_allocation():
+            thread = threading.Thread(target=lambda: seen.append(get_batch_allocation()))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None])
+
+
+class BatchAllocationSaveTests(TestCase):
+    def test_bulk_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                with randomfields.batch_allocation(50):
+                    objs = [TestUnique.objects.create() for _ in range(50)]
+        values = set(obj.unique_field for obj in objs)
+        self.assertEqual(len(values), 50)
+        self.assertEqual(TestUnique.objects.filter(unique_field__in=values).count(), 50)
+        
+        sql = [query["sql"] for query in context.captured_queries]
+        # one count and one probe for all saves
+        self.assertEqual(len([query for query in sql if query.startswith("SELECT")]), 2)
+        self.assertEqual(len([query for query in sql if query.startswith("INSERT")]), 50)
+        # the outer atomic block and one per save
+        self.assertEqual(len([query for query in sql if query.startswith("SAVEPOINT")]), 1 + 50)
+    
+    def test_collision_in_transaction_is_retried(self):
+        taken = TestUnique.objects.create().unique_field
+        with transaction.atomic():
+            with randomfields.batch_allocation(10) as allocation:
+                # inserted by a concurrent writer after it was verified
+                allocation.values[(TestUnique, "unique_field", "default", ())] = set([taken])
+                obj = TestUnique.objects.create()
+            self.assertNotEqual(obj.unique_field, taken)
+            self.assertEqual(TestUnique.objects.count(), 2)
+    
+    def test_small_keyspace(self):
+        with randomfields.batch_allocation(10):
+            values = set(TestMinLengthPossibilities.objects.create().data for _ in range(6))
+        self.assertEqual(values, set(["a", "b", "aa", "ab", "ba", "bb"]))
+    
+    def test_scopes(self):
+        with randomfields.batch_allocation():
+            for tenant in (1, 2):
+                codes = set(TestScopedChar.objects.create(tenant=tenant).code for _ in range(2))
+                self.assertEqual(codes, set(["a", "b"]))
@@ -0,0 +1,93 @@
+import os
+import pickle
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase
+from six import text_type
+from randomfields import encoding as codecs
+from randomfields.models.fields import RandomBinaryField, BinaryIdentifier
+from . import mock
+from .models import TestBinary, TestBinaryBase32
+
+
+class EncodingTests(SimpleTestCase):
+    def test_round_trip(self):
+        values = [b"", b"\0", b"\0\0\x01", b"\xff" * 16, os.urandom(32)]
+        for encoding in codecs.codecs:
+            for value in values:
+                text = codecs.encode(value, encoding)
+                self.assertIsInstance(text, text_type)
+                self.assertEqual(codecs.decode(text, encoding), value)
+
+    def test_known_values(self):
+        self.assertEqual(codecs.encode(b"hello", "base32"), "NBSWY3DP")
+        self.assertEqual(codecs.decode("nbswy3dp", "base32"), b"hello")
+        self.assertEqual(codecs.encode(b"hello world", "base58"), "StV1DL6CwTryKyV")
+        self.assertEqual(codecs.encode(b"\0\0\x01", "base58"), "112")
+        self.assertEqual(codecs.encode(b"\xfb\xff", "base64url"), "-_8")
+
+    def test_invalid_values(self):
+        for encoding, value in (("base32", "NBSWY3D1"), ("base58", "0OIl"), ("base64url", "-_8="), ("base64url", "+/8")):
+            with self.assertRaises(ValueError):
+                codecs.decode(value, encoding)
+        with self.assertRaises(ValueError):
+            codecs.encode(b"", "base16")
+
+
+class BinaryFieldTests(SimpleTestCase):
+    def test_kwargs(self):
+        with self.assertRaises(TypeError):
+            RandomBinaryField()
+        with self.assertRaises(ValueError):
+            RandomBinaryField(max_length=0)
+        with self.assertRaises(ValueError):
+            RandomBinaryField(max_length=16, encoding="base16")
+
+    def test_possibilities(self):
+        self.assertEqual(RandomBinaryField(max_length=16).possibilities, 2 ** 128)
+
+    @mock.patch('randomfields.random.os.urandom', side_effect=os.urandom)
+    def test_random_single_read(self, mocked_urandom):
+        value = RandomBinaryField(max_length=16).random()
+        self.assertEqual(mocked_urandom.call_count, 1)
+        self.assertIsInstance(value, BinaryIdentifier)
+        self.assertEqual(len(value.db_value), 16)
+        self.assertEqual(len(value), 22)
+
+    def test_conversions(self):
+        field = RandomBinaryField(max_length=5, encoding="base32")
+        value = field.to_python(b"hello")
+        self.assertEqual(value, "NBSWY3DP")
+        self.assertEqual(field.to_python("nbswy3dp"), value)
+        self.assertEqual(field.to_python(memoryview(b"hello")), value)
+        self.assertEqual(field.get_prep_value("NBSWY3DP"), b"hello")
+        self.assertEqual(pickle.loads(pickle.dumps(value)).db_value, b"hello")
+
+    def test_formfield(self):
+        form_field = RandomBinaryField(max_length=5, encoding="base32").formfield()
+        self.assertEqual(form_field.clean("nbswy3dp"), "NBSWY3DP")
+        for value in ("NBSWY3D1", "NBSWY3DPNA"):
+            with self.assertRaises(ValidationError):
+                form_field.clean(value)
+
+
+class BinaryFieldSaveTests(TestCase):
+    def test_save_and_query(self):
+        obj = TestBinary.objects.create()
+        self.assertIsInstance(obj.data, BinaryIdentifier)
+        obj.full_clean()
+
+        obj = TestBinary.objects.get(data=text_type(obj.data))
+        self.assertIsInstance(obj.data, BinaryIdentifier)
+        self.assertEqual(len(obj.data.db_value), 16)
+        self.assertEqual(list(TestBinary.objects.filter(data__in=[obj.data])), [obj])
+
+        with self.assertRaises(IntegrityError):
+            TestBinary.objects.create(data=obj.data.db_value)
+
+    def test_form_input(self):
+        obj = TestBinaryBase32.objects.create(data="nbswy3dp")
+        obj = TestBinaryBase32.objects.get(pk=obj.pk)
+        self.assertEqual(obj.data, "NBSWY3DP")
+        self.assertEqual(obj.data.db_value, b"hello")
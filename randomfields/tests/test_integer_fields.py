@@ -1,20 +1,29 @@
 import json
-from unittest import skipIf
+import os
+import subprocess
+import sys
+import threading
+from unittest import skipIf, skipUnless
 
+from django.apps import apps
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.test import SimpleTestCase
-from six import integer_types, string_types
+from django.db import IntegrityError, connection, models, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from six import integer_types, string_types, text_type
 from six.moves import range
 from randomfields.models.fields import RandomFieldMixin
-from randomfields.models.fields.integer import RandomIntegerFieldMixin, RandomBigIntegerField, RandomIntegerField, RandomSmallIntegerField, \
+from randomfields.models.fields.integer import RandomIntegerFieldMixin, RandomIntegerIdentifierFieldMixin, RandomBigIntegerField, RandomIntegerField, RandomSmallIntegerField, \
                                         RandomBigIntegerIdentifierField, RandomIntegerIdentifierField, RandomSmallIntegerIdentifierField, \
-                                        NarrowPositiveIntegerField, IntegerIdentifier
+                                        NarrowPositiveIntegerField, IntegerIdentifier, RandomTimeSortedBigIntegerField
+from randomfields.models.sequence import Sequence, get_database_sequence_name
+from randomfields.models.functions import IdentifierDisplay
+from randomfields.permutation import Permutation
 from .. import random
 from . import mock
-from .models import TestIdentifierValue
+from .models import TestHugeText, TestUncheckedBigInteger, TestAdaptiveBatches, TestPermutationInteger, TestPermutationIdentifier, TestTimeSortedBigInteger, TestIdentifierValue, TestIdentifierData, TestBigIdentifierData, TestSmallIdentifierData
 
 
 def raise_not_implemented(*args, **kwargs):
@@ -108,6 +117,33 @@ class FieldTests(SimpleTestCase):
                     # verify mocked_insecure_random.choice was called
                     self.assertEqual(mocked_insecure_random.choice.call_count, 1)
     
+    def test_random_lazy_initialization(self):
+        # importing randomfields.random neither probes os.urandom nor reads settings
+        code = "\n".join([
+            "import sys",
+            "from django.conf import settings",
+            "import randomfields.random as random",
+            # module __getattr__ requires python 3.7, older versions probe at import
+            "assert random._urandom_available is None or sys.version_info < (3, 7)",
+            "assert random.log_exceptions is None",
+            "assert not settings.configured",
+            "assert random.urandom_available is True",
+        ])
+        env = dict((key, value) for key, value in os.environ.items() if key != "DJANGO_SETTINGS_MODULE")
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        subprocess.check_call([sys.executable, "-c", code], env=env)
+
+    @mock.patch('randomfields.random._urandom_available', new=None)
+    @mock.patch('randomfields.random.urandom_available', new=None, create=True)
+    @mock.patch('randomfields.random.log_exceptions', new=None)
+    def test_random_urandom_unavailable(self):
+        with mock.patch('os.urandom', side_effect=NotImplementedError):
+            self.assertFalse(random.is_urandom_available())
+        # the result is kept
+        self.assertFalse(random.is_urandom_available())
+        with override_settings(SILENCED_SYSTEM_CHECKS=["randomfields.models.fields.base.RandomFieldMixin.InsecurePRNG"]):
+            self.assertFalse(random.get_log_exceptions())
+
     def test_zero_possibilities(self):
         class LocalTestField(RandomFieldMixin, models.Field):
             pass
@@ -341,3 +377,438 @@ class IntegerIdentifierFieldTests(SimpleTestCase):
         
         self.assertEqual(actual_max_limit, expected_max_limit)
         self.assertEqual(actual_min_limit, expected_min_limit)
+
+
+class IdentifierDisplayTests(TestCase):
+    def _create(self, model_class, *db_values):
+        pks = [model_class.objects.create(data=db_value).pk for db_value in db_values]
+        return [model_class.objects.get(pk=pk) for pk in pks]
+    
+    def test_display_annotation(self):
+        for model_class in (TestIdentifierData, TestBigIdentifierData, TestSmallIdentifierData):
+            field = model_class._meta.get_field("data")
+            objs = self._create(model_class, field.lower_bound, -1, 0, 1, field.upper_bound)
+            displays = dict(model_class.objects.annotate(display=IdentifierDisplay("data")).values_list("pk", "display"))
+            for obj in objs:
+                self.assertEqual(displays[obj.pk], text_type(obj.data))
+            
+            ordered = list(model_class.objects.order_by(IdentifierDisplay("data")).values_list("pk", flat=True))
+            self.assertEqual(ordered, [obj.pk for obj in objs])
+    
+    def test_display_exact(self):
+        obj1, obj2 = self._create(TestBigIdentifierData, -1, 1)
+        qs = TestBigIdentifierData.objects.filter(data__display=text_type(obj2.data))
+        self.assertEqual(list(qs), [obj2])
+        self.assertIn('"data" =', text_type(qs.query))
+        
+        # values that cannot be display strings never match
+        for value in ("", "abc", "1", text_type(obj2.data) + "0"):
+            self.assertFalse(TestBigIdentifierData.objects.filter(data__display=value).exists())
+    
+    def test_display_in(self):
+        obj1, obj2, obj3 = self._create(TestIdentifierData, -1, 0, 1)
+        qs = TestIdentifierData.objects.filter(data__display__in=[text_type(obj1.data), "foo", obj3.data.display_value])
+        self.assertEqual(set(qs), set([obj1, obj3]))
+        self.assertFalse(TestIdentifierData.objects.filter(data__display__in=["foo"]).exists())
+    
+    def test_display_range(self):
+        obj1, obj2, obj3 = self._create(TestIdentifierData, -1, 0, 1)
+        qs = TestIdentifierData.objects.filter(data__display__range=(obj2.data, obj3.data.display_value + 10))
+        self.assertEqual(set(qs), set([obj2, obj3]))
+        self.assertFalse(TestIdentifierData.objects.filter(data__display__range=(1, 10)).exists())
+        self.assertFalse(TestIdentifierData.objects.filter(data__display__range=("abc", "x")).exists())
+        self.assertFalse(TestIdentifierData.objects.filter(data__display__range=(obj2.data, "x")).exists())
+    
+    def test_startswith(self):
+        objs = self._create(TestSmallIdentifierData, -32768, -1, 0, 32767)
+        expected = {
+            "": objs,
+            "3": [objs[0]],
+            "32768": [objs[0]],
+            "6553": [objs[1], objs[2]],
+            "65536": [objs[2]],
+            "9": [objs[3]],
+            "1": [],
+            "abc": [],
+            "327680": [],
+        }
+        for prefix, values in expected.items():
+            for lookup in ("data__startswith", "data__istartswith", "data__display__startswith"):
+                qs = TestSmallIdentifierData.objects.filter(**{lookup: prefix}).order_by("data")
+                self.assertEqual(list(qs), values, "%s=%r" % (lookup, prefix))
+        
+        self.assertIn("BETWEEN", text_type(TestSmallIdentifierData.objects.filter(data__startswith="6").query))
+    
+    def test_big_startswith_zero_filled(self):
+        obj1, obj2 = self._create(TestBigIdentifierData, -9223372036854775808, 0)
+        self.assertEqual(text_type(obj1.data), "09223372036854775808")
+        self.assertEqual(list(TestBigIdentifierData.objects.filter(data__startswith="0")), [obj1])
+        self.assertEqual(list(TestBigIdentifierData.objects.filter(data__startswith="1844")), [obj2])
+
+
+class IdentifierInLookupTests(TestCase):
+    def test_get_prep_values(self):
+        field = TestIdentifierData._meta.get_field("data")
+        values = [-2147483648, 0, "4294967296", 6442450943, IntegerIdentifier(5, field.possibilities, field.lower_bound, field.upper_bound), None, 0]
+        self.assertEqual(sorted(field.get_prep_values(values)), [-2147483648, 0, 5, 2147483647])
+        for value in values[:-2]:
+            self.assertIn(field.get_prep_value(value), field.get_prep_values([value]))
+    
+    def test_in_lookup(self):
+        objs = [TestIdentifierData.objects.create(data=db_value) for db_value in (-1, 0, 1)]
+        displays = [text_type(TestIdentifierData.objects.get(pk=obj.pk).data) for obj in objs]
+        
+        qs = TestIdentifierData.objects.filter(data__in=[displays[0], int(displays[2]), -1])
+        self.assertEqual(set(qs), set([objs[0], objs[2]]))
+        self.assertFalse(TestIdentifierData.objects.filter(data__in=[]).exists())
+        
+        # subqueries are passed through
+        qs = TestIdentifierData.objects.filter(data__in=TestIdentifierData.objects.filter(pk=objs[1].pk).values("data"))
+        self.assertEqual(list(qs), [objs[1]])
+        qs = TestIdentifierData.objects.filter(data__in=TestIdentifierData.objects.filter(pk=objs[1].pk).values("data").query)
+        self.assertEqual(list(qs), [objs[1]])
+    
+    def test_in_lookup_skips_per_value_conversion(self):
+        values = [text_type(4294967296 + n) for n in range(1000)]
+        with mock.patch.object(RandomIntegerIdentifierFieldMixin, "to_python") as mocked_to_python:
+            TestIdentifierValue.objects.filter(pk__in=values).count()
+        self.assertEqual(mocked_to_python.call_count, 0)
+    
+    def test_in_lookup_sql(self):
+        qs = TestIdentifierValue.objects.filter(pk__in=["4294967296", "4294967297"])
+        sql, params = qs.query.sql_with_params()
+        if connection.vendor == "postgresql":
+            self.assertIn("= ANY(", sql)
+            self.assertIn([0, 1], params)
+        else:
+            self.assertEqual(sorted(params), [0, 1])
+    
+    def test_in_lookup_max_in_list_size(self):
+        objs = [TestIdentifierValue.objects.create() for _ in range(5)]
+        displays = [text_type(TestIdentifierValue.objects.get(pk=obj.pk).pk) for obj in objs]
+        with mock.patch.object(connection.ops, "max_in_list_size", return_value=2):
+            qs = TestIdentifierValue.objects.filter(pk__in=displays)
+            sql, params = qs.query.sql_with_params()
+            self.assertEqual(sql.count(" IN ("), 3)
+            self.assertNotIn("= ANY(", sql)
+            self.assertEqual(sorted(params), sorted(obj.pk.db_value for obj in objs))
+            self.assertEqual(set(qs), set(objs))
+
+
+class TimeSortedBigIntegerFieldTests(TestCase):
+    def test_time_bits(self):
+        field = RandomTimeSortedBigIntegerField(time_bits=40)
+        self.assertEqual(field.random_bits, 24)
+        self.assertEqual(field.bucket_possibilities, 2 ** 24)
+        self.assertEqual(field.possibilities, 2 ** 64)
+        for time_bits in (0, 64):
+            with self.assertRaises(ValueError):
+                RandomTimeSortedBigIntegerField(time_bits=time_bits)
+        with self.assertRaises(ValueError):
+            RandomTimeSortedBigIntegerField(resolution=0)
+    
+    def test_bucket_bounds(self):
+        field = RandomTimeSortedBigIntegerField()
+        self.assertEqual(field.get_bucket_bounds(0), (field.lower_bound, field.lower_bound + 2 ** 32 - 1))
+        self.assertEqual(field.get_bucket_bounds(2 ** 32 - 1)[1], field.upper_bound)
+        with mock.patch('time.time', return_value=field.epoch + 10.5):
+            self.assertEqual(field.current_bucket(), 10)
+            for _ in range(10):
+                low, high = field.get_bucket_bounds(10)
+                self.assertTrue(low <= field.random() <= high)
+    
+    def test_values_sort_by_time(self):
+        field = TestTimeSortedBigInteger._meta.get_field("id")
+        pks = []
+        for offset in (0, 1, 2, 60, 3600):
+            with mock.patch('time.time', return_value=field.epoch + offset):
+                pks.append(TestTimeSortedBigInteger.objects.create().pk)
+        self.assertEqual(pks, sorted(pks))
+    
+    def test_occupancy_counts_current_bucket(self):
+        field = TestTimeSortedBigInteger._meta.get_field("id")
+        with mock.patch('time.time', return_value=field.epoch):
+            TestTimeSortedBigInteger.objects.create()
+            TestTimeSortedBigInteger.objects.create()
+            self.assertEqual(field.get_occupancy(TestTimeSortedBigInteger), (2, 2 ** 32))
+        with mock.patch('time.time', return_value=field.epoch + 1):
+            self.assertEqual(field.get_occupancy(TestTimeSortedBigInteger), (0, 2 ** 32))
+
+
+class PermutationTests(SimpleTestCase):
+    def test_bijection(self):
+        for size in (1, 2, 3, 5, 64, 100, 1000):
+            permutation = Permutation(b"key", size)
+            values = [permutation.permute(i) for i in range(size)]
+            self.assertEqual(sorted(values), list(range(size)))
+            for i, value in enumerate(values):
+                self.assertEqual(permutation.invert(value), i)
+    
+    def test_keyed(self):
+        values1 = [Permutation(b"key1", 1000).permute(i) for i in range(1000)]
+        values2 = [Permutation("key2", 1000).permute(i) for i in range(1000)]
+        self.assertNotEqual(values1, values2)
+        self.assertNotEqual(values1, list(range(1000)))
+    
+    def test_large_domain(self):
+        permutation = Permutation(b"key", 2 ** 64)
+        for i in (0, 1, 2 ** 63, 2 ** 64 - 1):
+            value = permutation.permute(i)
+            self.assertTrue(0 <= value < 2 ** 64)
+            self.assertEqual(permutation.invert(value), i)
+    
+    def test_invalid_values(self):
+        with self.assertRaises(ValueError):
+            Permutation(b"key", 0)
+        permutation = Permutation(b"key", 10)
+        for value in (-1, 10):
+            with self.assertRaises(ValueError):
+                permutation.permute(value)
+    
+    def test_unsupported_field(self):
+        with self.assertRaises(TypeError):
+            RandomTimeSortedBigIntegerField(permutation=True)
+        with self.assertRaises(ValueError):
+            RandomIntegerField(permutation=True, permutation_block_size=0)
+    
+    def test_missing_key_check(self):
+        field = TestPermutationInteger._meta.get_field("data")
+        key = "randomfields.models.fields.base.RandomFieldMixin.PermutationKeyMissing"
+        self.assertNotIn(key, [error.id for error in field.check()])
+        with override_settings(RANDOMFIELDS_PERMUTATION_KEY=None):
+            self.assertIn(key, [error.id for error in field.check()])
+    
+    def test_app_not_installed_check(self):
+        field = TestPermutationInteger._meta.get_field("data")
+        key = "randomfields.models.fields.base.RandomFieldMixin.AppNotInstalled"
+        self.assertNotIn(key, [error.id for error in field.check()])
+        with mock.patch.object(apps, "is_installed", return_value=False):
+            self.assertIn(key, [error.id for error in field.check()])
+    
+    def test_fields_without_app(self):
+        # projects that do not use permutation or pool need not install the app
+        code = "\n".join([
+            "from django.conf import settings",
+            "settings.configure(INSTALLED_APPS=['django.contrib.contenttypes'])",
+            "import django",
+            "django.setup()",
+            "import randomfields.models",
+            "from randomfields.models.fields import RandomCharField",
+        ])
+        env = dict((key, value) for key, value in os.environ.items() if key != "DJANGO_SETTINGS_MODULE")
+        env["PYTHONPATH"] = os.pathsep.join(sys.path)
+        subprocess.check_call([sys.executable, "-c", code], env=env)
+
+
+class PermutationFieldTests(TestCase):
+    def setUp(self):
+        # reserved blocks outlive the test transaction
+        for model_class, name in ((TestPermutationInteger, "data"), (TestPermutationIdentifier, "id")):
+            model_class._meta.get_field(name)._sequence_blocks.clear()
+    
+    def test_all_possibilities_without_probes(self):
+        field = TestPermutationInteger._meta.get_field("data")
+        with CaptureQueriesContext(connection) as context:
+            values = [TestPermutationInteger.objects.create().data for _ in range(field.possibilities)]
+        self.assertEqual(sorted(values), list(range(field.lower_bound, field.upper_bound + 1)))
+        self.assertNotEqual(values, sorted(values))
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn(" IN (", query["sql"])
+        
+        with self.assertRaises(IntegrityError):
+            TestPermutationInteger.objects.create()
+    
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL reserves blocks from a database sequence")
+    def test_block_reservation(self):
+        with CaptureQueriesContext(connection) as context:
+            objs = [TestPermutationIdentifier.objects.create() for _ in range(10)]
+        updates = [query for query in context.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(len(set(obj.pk for obj in objs)), 10)
+        self.assertIsInstance(objs[0].pk, IntegerIdentifier)
+        self.assertEqual(Sequence.objects.get(name="tests.testpermutationidentifier.id").value, 10)
+    
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL reserves blocks from a database sequence")
+    def test_block_dropped_on_rollback(self):
+        name = "tests.testpermutationidentifier.id"
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                first = TestPermutationIdentifier.objects.create()
+                raise RuntimeError()
+        self.assertFalse(Sequence.objects.filter(name=name).exists())
+        
+        # the rolled back block may be reserved by another process
+        obj = TestPermutationIdentifier.objects.create()
+        self.assertEqual(obj.pk, first.pk)
+        self.assertEqual(Sequence.objects.get(name=name).value, 10)
+    
+    def test_block_per_thread(self):
+        field = TestPermutationIdentifier._meta.get_field("id")
+        blocks = iter([list(range(start, start + 10)) for start in range(0, 100, 10)])
+        values = {}
+        def draw(name):
+            values[name] = [field.next_sequence_value(TestPermutationIdentifier) for _ in range(5)]
+        with mock.patch.object(Sequence.objects, "reserve_block", side_effect=lambda *args, **kwargs: next(blocks)) as reserve:
+            threads = [threading.Thread(target=draw, args=(name,)) for name in ("a", "b")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            draw("main")
+        # each thread draws from its own block without waiting for the others
+        self.assertEqual(reserve.call_count, 3)
+        self.assertEqual(sorted(values["a"] + values["b"] + values["main"]), sorted([0, 1, 2, 3, 4, 10, 11, 12, 13, 14, 20, 21, 22, 23, 24]))
+        for name in values:
+            self.assertEqual(values[name], list(range(values[name][0], values[name][0] + 5)))
+    
+    def test_collision_with_existing_value(self):
+        field = TestPermutationInteger._meta.get_field("data")
+        first = field.value_from_index(field.index_permutation.permute(0))
+        TestPermutationInteger.objects.create(data=first)
+        
+        # the save rolls back to its savepoint and uses the next value
+        with transaction.atomic():
+            obj = TestPermutationInteger.objects.create()
+        self.assertNotEqual(obj.data, first)
+
+
+class PermutationRetryTests(TransactionTestCase):
+    def setUp(self):
+        TestPermutationInteger._meta.get_field("data")._sequence_blocks.clear()
+    
+    def test_collision_with_existing_value(self):
+        field = TestPermutationInteger._meta.get_field("data")
+        first = field.value_from_index(field.index_permutation.permute(0))
+        TestPermutationInteger.objects.create(data=first)
+        
+        # outside of a transaction the next value is used
+        obj = TestPermutationInteger.objects.create()
+        self.assertNotEqual(obj.data, first)
+    
+    def test_sequence_reserve(self):
+        self.assertEqual(Sequence.objects.reserve("test", 5), 0)
+        self.assertEqual(Sequence.objects.reserve("test", 1), 5)
+        self.assertEqual(Sequence.objects.reserve("test", 2), 6)
+        self.assertEqual(Sequence.objects.get(name="test").value, 8)
+    
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL reserves blocks from a database sequence")
+    def test_sequence_reserve_block(self):
+        self.assertTrue(Sequence.objects.is_transactional())
+        self.assertEqual(Sequence.objects.reserve_block("test", 3), [0, 1, 2])
+        self.assertEqual(Sequence.objects.reserve_block("test", 2), [3, 4])
+    
+    @skipUnless(connection.vendor == "postgresql", "Database sequences are only used on PostgreSQL")
+    def test_sequence_reserve_block_postgresql(self):
+        self.assertFalse(Sequence.objects.is_transactional())
+        name = "tests.testpermutationidentifier.id"
+        self.assertEqual(Sequence.objects.reserve_block(name, 3), [0, 1, 2])
+        # the values are not returned by a rollback and the table is unused
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.assertEqual(Sequence.objects.reserve_block(name, 2), [3, 4])
+                raise RuntimeError()
+        self.assertEqual(Sequence.objects.reserve_block(name, 1), [5])
+        self.assertFalse(Sequence.objects.filter(name=name).exists())
+        with connection.cursor() as cursor:
+            cursor.execute("DROP SEQUENCE %s" % connection.ops.quote_name(get_database_sequence_name(name)))
+
+
+class AdaptiveBatchesTests(TestCase):
+    def setUp(self):
+        self.field = TestAdaptiveBatches._meta.get_field("data")
+        self.field._collision_estimates.clear()
+    
+    def test_count_only_on_cold_start(self):
+        with CaptureQueriesContext(connection) as context:
+            TestAdaptiveBatches.objects.create()
+        self.assertTrue(any("COUNT(" in query["sql"] for query in context.captured_queries))
+        with CaptureQueriesContext(connection) as context:
+            TestAdaptiveBatches.objects.create()
+        self.assertFalse(any("COUNT(" in query["sql"] for query in context.captured_queries))
+        self.assertEqual(self.field._collision_estimates[("default", ())][1], 20)
+    
+    def test_estimate_follows_collisions(self):
+        TestAdaptiveBatches.objects.create()
+        rate = self.field._collision_estimates[("default", ())][0]
+        self.field.observe_collisions(3, 4, ("default", ()))
+        self.assertGreater(self.field._collision_estimates[("default", ())][0], rate)
+        rate = self.field._collision_estimates[("default", ())][0]
+        self.field.observe_collisions(0, 4, ("default", ()))
+        self.assertLess(self.field._collision_estimates[("default", ())][0], rate)
+    
+    def test_fills_keyspace(self):
+        values = set(TestAdaptiveBatches.objects.create().data for _ in range(20))
+        self.assertEqual(values, set(range(1, 21)))
+        with self.assertRaises(IntegrityError):
+            TestAdaptiveBatches.objects.create()
+    
+    def test_retries_bounded_by_max_retry(self):
+        for value in range(1, 7):
+            TestAdaptiveBatches.objects.create(data=value)
+        TestAdaptiveBatches.objects.create()
+        rate = self.field._collision_estimates[("default", ())][0]
+        
+        # every value handed out collides more often than max_retry allows
+        obj = TestAdaptiveBatches(data=6)
+        self.field.persist_available_values(obj, set(range(1, 6)))
+        with self.assertRaises(IntegrityError):
+            obj.save()
+        self.assertGreater(self.field._collision_estimates[("default", ())][0], rate)
+    
+    def test_full_estimate_counts_again(self):
+        TestAdaptiveBatches.objects.create()
+        self.field._collision_estimates[("default", ())] = [1.0, 20]
+        with CaptureQueriesContext(connection) as context:
+            TestAdaptiveBatches.objects.create()
+        self.assertTrue(any("COUNT(" in query["sql"] for query in context.captured_queries))
+        self.assertLess(self.field._collision_estimates[("default", ())][0], 1)
+    
+    def test_candidates_capped(self):
+        field = TestIdentifierValue._meta.get_field("id")
+        key = ("default", ())
+        self.addCleanup(field._collision_estimates.pop, key, None)
+        field._collision_estimates[key] = [1 - 1e-9, field.possibilities]
+        with mock.patch.object(field.logger, "warning"):
+            values = field.find_available_values(TestIdentifierValue)
+        self.assertEqual(len(values), field.max_candidates)
+
+
+class CollisionCheckTests(TestCase):
+    def test_skips_collision_checks(self):
+        self.assertTrue(TestUncheckedBigInteger._meta.get_field("data").skips_collision_checks)
+        self.assertFalse(TestAdaptiveBatches._meta.get_field("data").skips_collision_checks)
+        self.assertFalse(RandomIntegerField(unique=True).skips_collision_checks)
+        # collision checks are only skipped when asked for
+        self.assertFalse(RandomBigIntegerField(unique=True).skips_collision_checks)
+        self.assertFalse(RandomBigIntegerField(unique=True, collision_risk=1e-9, max_rows=2 ** 40).skips_collision_checks)
+        # the time bucket holds 2 ** 32 values
+        self.assertFalse(TestTimeSortedBigInteger._meta.get_field("id").skips_collision_checks)
+        with override_settings(RANDOMFIELDS_COLLISION_RISK=1e-9):
+            self.assertTrue(RandomBigIntegerField(unique=True).skips_collision_checks)
+        with override_settings(RANDOMFIELDS_COLLISION_RISK=1e-15):
+            self.assertFalse(RandomBigIntegerField(unique=True).skips_collision_checks)
+    
+    def test_kwargs(self):
+        for kwargs in (dict(max_rows=0), dict(max_rows=-1), dict(collision_risk=-1), dict(collision_risk=1)):
+            with self.assertRaises(ValueError):
+                RandomBigIntegerField(unique=True, **kwargs)
+    
+    def test_no_queries_before_insert(self):
+        with CaptureQueriesContext(connection) as context:
+            TestUncheckedBigInteger.objects.create()
+        self.assertFalse([query for query in context.captured_queries if query["sql"].startswith("SELECT")])
+    
+    def test_collision_is_retried(self):
+        field = TestUncheckedBigInteger._meta.get_field("data")
+        TestUncheckedBigInteger.objects.create(data=5)
+        with mock.patch.object(field, "random", side_effect=[5, 6]):
+            obj = TestUncheckedBigInteger.objects.create()
+        self.assertEqual(obj.data, 6)
+    
+    def test_huge_keyspace(self):
+        field = TestHugeText._meta.get_field("data")
+        self.assertGreater(field.possibilities, 10 ** 400)
+        TestHugeText.objects.create()
+        values = field.find_available_values(TestHugeText)
+        self.assertEqual(len(values), 2)
@@ -0,0 +1,94 @@
+import csv
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from six import StringIO
+from randomfields.minting import generate_run, merge_runs, mint, read_run, shuffle_run, write_run
+from .models import TestBackfillChar, TestBackfillIdentifier, TestScopedChar
+
+class MintTests(TestCase):
+    def setUp(self):
+        self.field = TestBackfillChar._meta.get_field("data")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+    
+    def test_merge_runs(self):
+        taken = [write_run(["b", "d"], self.directory)[0]]
+        runs = [write_run(values, self.directory)[0] for values in (["a", "b", "c"], ["c", "e", "a"])]
+        path, count = merge_runs(taken, runs, self.directory)
+        self.assertEqual(count, 3)
+        self.assertEqual(list(read_run(path)), ["a", "c", "e"])
+        # the merged runs are removed
+        self.assertFalse(any(os.path.exists(run) for run in runs))
+    
+    def test_shuffle_run(self):
+        values = ["%03d" % i for i in range(100)]
+        path, count = write_run(values, self.directory)
+        shuffled = list(shuffle_run(path, count, 7, self.directory))
+        self.assertEqual(sorted(shuffled), values)
+        self.assertNotEqual(shuffled, values)
+    
+    def test_mint(self):
+        TestBackfillChar.objects.bulk_create([TestBackfillChar(data=value) for value in ("a", "b", "ab")])
+        progress = []
+        values = list(mint(self.field, 5, workers=1, chunk_size=2, callback=lambda *args: progress.append(args)))
+        # the 8 possibilities minus the 3 stored values
+        self.assertEqual(len(set(values)), 5)
+        self.assertFalse(set(values) & set(["a", "b", "ab"]))
+        self.assertEqual(progress[-1], (5, 5))
+    
+    def test_mint_processes(self):
+        values = list(mint(self.field, 8, workers=2, chunk_size=3))
+        self.assertEqual(sorted(values), sorted(self.field.value_from_index(i) for i in range(8)))
+    
+    def test_mint_exhausted(self):
+        TestBackfillChar.objects.create(data="a")
+        with self.assertRaises(ValueError):
+            list(mint(self.field, 8, workers=1))
+    
+    def test_mint_scope(self):
+        field = TestScopedChar._meta.get_field("code")
+        TestScopedChar.objects.create(tenant=1, code="a")
+        TestScopedChar.objects.create(tenant=2, code="a")
+        # "a" is one taken value of the 2 possibilities
+        self.assertEqual(list(mint(field, 1, workers=1)), ["b"])
+        self.assertEqual(list(mint(field, 1, workers=1, scope=(1,))), ["b"])
+        self.assertEqual(sorted(mint(field, 2, workers=1, scope=(3,))), ["a", "b"])
+        with self.assertRaises(ValueError):
+            list(mint(field, 2, workers=1, scope=(1,)))
+    
+    def test_generate_run_label(self):
+        path, count = generate_run(5, self.directory, label="tests.TestBackfillChar.data")
+        self.assertTrue(0 < count <= 5)
+        self.assertTrue(all(len(value) == 3 for value in read_run(path)))
+    
+    def test_command_csv(self):
+        output = os.path.join(self.directory, "codes.csv")
+        out = StringIO()
+        call_command("randomfields_mint", "tests.TestBackfillChar.data", count=6, output=output, workers=1, stdout=out)
+        self.assertIn("Minted 6 values", out.getvalue())
+        with open(output) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["data"])
+        self.assertEqual(len(set(row[0] for row in rows[1:])), 6)
+    
+    def test_command_insert(self):
+        call_command("randomfields_mint", "tests.TestBackfillIdentifier.data", count=5, insert=True, batch_size=2, workers=1, stdout=StringIO())
+        values = set(TestBackfillIdentifier.objects.values_list("data", flat=True))
+        self.assertEqual(len(values), 5)
+    
+    def test_command_errors(self):
+        with self.assertRaises(CommandError):
+            call_command("randomfields_mint", "tests.TestBackfillChar.id", count=1, insert=True, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("randomfields_mint", "tests.TestUncheckedBigInteger.data", count=1, insert=True, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("randomfields_mint", "tests.TestBackfillChar.data", count=1, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("randomfields_mint", "tests.TestBackfillChar.data", count=9, insert=True, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command("randomfields_mint", "tests.TestBackfillChar.data", insert=True, stdout=StringIO())
@@ -0,0 +1,90 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from six import StringIO
+from randomfields.management.commands import randomfields_fill_pool
+from randomfields.models.pool import PooledValue, get_value_hash
+from randomfields.models.fields import RandomCharField
+from . import mock
+from .models import TestPooledChar
+
+class PoolTests(TestCase):
+    def setUp(self):
+        self.field = TestPooledChar._meta.get_field("data")
+        self.field.pool_metrics.clear()
+        self.name = self.field.sequence_name
+    
+    def fill(self, *args, **kwargs):
+        out = StringIO()
+        call_command("randomfields_fill_pool", *args, stdout=out, **kwargs)
+        return out.getvalue()
+    
+    def test_kwargs(self):
+        with self.assertRaises(ValueError):
+            RandomCharField(max_length=2, pool=True)
+        with self.assertRaises(ValueError):
+            RandomCharField(unique=True, max_length=2, pool=True, permutation=True)
+    
+    def test_fill(self):
+        TestPooledChar.objects.create(data="aa")
+        output = self.fill("tests.TestPooledChar.data", size=2)
+        self.assertIn("2 values added", output)
+        values = set(PooledValue.objects.filter(name=self.name).values_list("value", flat=True))
+        self.assertEqual(len(values), 2)
+        self.assertNotIn("aa", values)
+        
+        # topped up to the requested size
+        self.assertIn("1 values added", self.fill(size=3))
+        self.assertEqual(PooledValue.objects.depth(self.name), 3)
+    
+    def test_fill_without_ignore_conflicts(self):
+        PooledValue.objects.create(name=self.name, value="aa")
+        command = randomfields_fill_pool.Command(stdout=StringIO())
+        with mock.patch.object(randomfields_fill_pool, "DJANGO_VERSION_LT_22", True):
+            # a value pooled concurrently is skipped
+            command.add_values(PooledValue.objects, self.name, ["aa", "ab"], "default")
+            self.assertIn("2 values added", self.fill(size=4))
+        self.assertEqual(PooledValue.objects.depth(self.name), 4)
+    
+    def test_long_values(self):
+        value = "a" * 300
+        PooledValue.objects.create(name=self.name, value=value)
+        self.assertEqual(PooledValue.objects.claim(self.name), value)
+    
+    def test_values_unique_by_hash(self):
+        obj = PooledValue.objects.create(name=self.name, value="a" * 300)
+        self.assertEqual(obj.value_hash, get_value_hash("a" * 300))
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                PooledValue.objects.create(name=self.name, value="a" * 300)
+        PooledValue.objects.create(name="other", value="a" * 300)
+    
+    def test_fill_exhausted(self):
+        output = self.fill("tests.TestPooledChar.data", size=10)
+        self.assertIn("The free values are exhausted", output)
+        self.assertEqual(PooledValue.objects.depth(self.name), 4)
+    
+    def test_fill_errors(self):
+        with self.assertRaises(CommandError):
+            self.fill("tests.TestPooledChar")
+        with self.assertRaises(CommandError):
+            self.fill("tests.TestPooledChar.missing")
+        with self.assertRaises(CommandError):
+            self.fill("tests.TestUnique.id")
+    
+    def test_claim(self):
+        self.fill(size=2)
+        pooled = set(PooledValue.objects.filter(name=self.name).values_list("value", flat=True))
+        values = set(TestPooledChar.objects.create().data for _ in range(2))
+        self.assertEqual(values, pooled)
+        self.assertEqual(PooledValue.objects.depth(self.name), 0)
+        self.assertEqual(self.field.pool_metrics["default"], {"hits": 2, "misses": 0})
+        self.assertIsNone(PooledValue.objects.claim(self.name))
+        self.fill(size=1)
+        self.assertEqual(self.field.get_pool_metrics(), {"hits": 2, "misses": 0, "depth": 1})
+    
+    def test_empty_pool_falls_back(self):
+        values = set(TestPooledChar.objects.create().data for _ in range(4))
+        self.assertEqual(values, set(["aa", "ab", "ba", "bb"]))
+        self.assertEqual(self.field.pool_metrics["default"], {"hits": 0, "misses": 4})
@@ -0,0 +1,136 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+import randomfields
+from .models import (
+    TestBigIdentifierData, TestBigIntegerChar, TestBinary, TestHugeText, TestIdentifierAllValue, TestIdentifierData,
+    TestIdentifierFKValue, TestIdentifierM2MValue, TestIdentifierO2OValue, TestIdentifierValue, TestPermutationIdentifier,
+    TestPermutationInteger, TestPrimaryKey, TestSmallIdentifierData, TestTimeSortedBigInteger, TestTimeSortedChar,
+    TestUncheckedBigInteger, TestUnique,
+)
+
+# The number of queries of each save path.  Adding a round trip to any of
+# them must be a deliberate change to these budgets.
+#
+# save() runs in a savepoint: SAVEPOINT and RELEASE SAVEPOINT.
+SAVEPOINT = 2
+# a new value of a field that may collide counts the occupied values and
+# probes the candidates before the INSERT.
+CHECKED_INSERT = SAVEPOINT + 3
+# fields that cannot realistically collide only INSERT.
+UNCHECKED_INSERT = SAVEPOINT + 1
+# a row that has its value is written without queries of the field.
+UPDATE = SAVEPOINT + 1
+
+checked_models = [
+    TestPrimaryKey,
+    TestUnique,
+    TestBigIntegerChar,
+    TestTimeSortedChar,
+    TestTimeSortedBigInteger,
+    TestIdentifierValue,
+    TestSmallIdentifierData,
+    TestHugeText,
+    TestBinary,
+    TestBigIdentifierData,
+]
+
+# fields that are not unique or skip collision checks through `collision_risk`
+unchecked_models = [
+    TestUncheckedBigInteger,
+    TestIdentifierData,
+]
+
+def get_random_field(model_cls):
+    return [field for field in model_cls._meta.local_fields if hasattr(field, "possibilities")][0]
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        # collisions observed by other tests would replace the COUNT
+        for model_cls in checked_models + unchecked_models:
+            get_random_field(model_cls)._collision_estimates.clear()
+
+    def test_insert(self):
+        for model_cls, budget in [(model_cls, CHECKED_INSERT) for model_cls in checked_models] + [(model_cls, UNCHECKED_INSERT) for model_cls in unchecked_models]:
+            with self.subTest(model=model_cls.__name__):
+                model_cls.objects.create()
+                with self.assertNumQueries(budget):
+                    model_cls.objects.create()
+
+    def test_update(self):
+        for model_cls in checked_models + unchecked_models:
+            with self.subTest(model=model_cls.__name__):
+                obj = model_cls.objects.get(pk=model_cls.objects.create().pk)
+                with self.assertNumQueries(UPDATE):
+                    obj.save()
+
+    def test_update_fields(self):
+        for model_cls in checked_models + unchecked_models:
+            field = get_random_field(model_cls)
+            if field.primary_key:
+                continue
+            with self.subTest(model=model_cls.__name__):
+                obj = model_cls.objects.get(pk=model_cls.objects.create().pk)
+                with self.assertNumQueries(UPDATE):
+                    obj.save(update_fields=[field.name])
+
+    def test_permutation_insert(self):
+        # the first save reserves a block of the sequence, every value taken
+        # from the block costs one INSERT of the row and nothing else
+        for model_cls in [TestPermutationInteger, TestPermutationIdentifier]:
+            with self.subTest(model=model_cls.__name__):
+                model_cls.objects.create()
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(5):
+                        model_cls.objects.create()
+                statements = [query["sql"] for query in queries.captured_queries]
+                self.assertEqual(len(statements), 5 * UNCHECKED_INSERT)
+                self.assertEqual(len([sql for sql in statements if sql.startswith("INSERT")]), 5)
+                self.assertEqual([sql for sql in statements if "randomfields_sequence" in sql], [])
+
+    def test_foreign_key_insert(self):
+        target = TestIdentifierValue.objects.create()
+        with self.assertNumQueries(1):
+            TestIdentifierFKValue.objects.create(data=target)
+        with self.assertNumQueries(1):
+            TestIdentifierO2OValue.objects.create(id=target)
+        with self.assertNumQueries(1):
+            TestIdentifierAllValue.objects.create(o2o=target, fk=target)
+
+    def test_foreign_key_update(self):
+        target = TestIdentifierValue.objects.create()
+        obj = TestIdentifierFKValue.objects.create(data=target)
+        obj = TestIdentifierFKValue.objects.get(pk=obj.pk)
+        with self.assertNumQueries(1):
+            obj.save()
+
+    def test_many_to_many(self):
+        targets = [TestIdentifierValue.objects.create() for _ in range(3)]
+        obj = TestIdentifierM2MValue.objects.create()
+        # the new values are inserted ignoring the existing ones or else the
+        # existing values are read first
+        with self.assertNumQueries(1 if getattr(connection.features, "supports_ignore_conflicts", False) else 2):
+            obj.data.add(*targets)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(obj.data.all()), 3)
+        with self.assertNumQueries(1):
+            obj.data.remove(targets[0])
+
+    def test_bulk_create(self):
+        # each object counts and probes on its own
+        for model_cls in checked_models:
+            with self.subTest(model=model_cls.__name__):
+                with self.assertNumQueries(2 * 10 + 1):
+                    model_cls.objects.bulk_create([model_cls() for _ in range(10)])
+        for model_cls in unchecked_models:
+            with self.subTest(model=model_cls.__name__):
+                with self.assertNumQueries(1):
+                    model_cls.objects.bulk_create([model_cls() for _ in range(10)])
+
+    def test_batch_allocation(self):
+        # one count and probe for the whole batch.  the values are verified
+        # so the saves only INSERT in their savepoint.
+        with randomfields.batch_allocation(10):
+            with self.assertNumQueries(2 + 10 * UNCHECKED_INSERT):
+                for _ in range(10):
+                    TestUnique.objects.create()
@@ -1,15 +1,18 @@
 from django.apps import apps
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.forms.models import model_to_dict
-from django.test import TestCase, SimpleTestCase
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from six import text_type
 from randomfields.models.fields.integer import IntegerIdentifier
-from randomfields.models.fields import RandomCharField, RandomTextField
+from randomfields.models.fields import RandomCharField, RandomTextField, RandomBigIntegerCharField, RandomTimeSortedCharField
 from unittest import skipIf
 from ..checks import DJANGO_VERSION_17
 from . import mock
-from .models import TestIdentifierData, TestIdentifierValue, TestPrimaryKey, TestUnique, TestMinLengthPossibilities, TestFixLengthPossibilities, TestNonUniqueIntegrityError, TestUniqueNotExistIntegrityError
+from .models import TestScopedGrowingChar, TestReservedChar, TestSoftDeleteChar, UniqueConstraint, TestScopedChar, TestConditionalScopedChar, TestGrowingChar, TestPermutationChar, TestTimeSortedChar, TestBigIntegerChar, TestBigIntegerCharPossibilities, TestIdentifierData, TestIdentifierValue, TestPrimaryKey, TestStrictLookups, TestUnique, TestMinLengthPossibilities, TestFixLengthPossibilities, TestNonUniqueIntegrityError, TestUniqueNotExistIntegrityError
 
 class AppConfigTests(SimpleTestCase):
     def test_app_is_installed(self):
@@ -358,4 +361,357 @@ class SaveTests(TestCase):
             # model field should not raise exception so that valid chars
             # can change without invalidating the database value
             self._test_string_field_validation(field_cls, kwargs, "bba")
-            self._test_string_field_validation(field_cls, kwargs, pi_value)
\ No newline at end of file
+            self._test_string_field_validation(field_cls, kwargs, pi_value)
+
+
+class BigIntegerCharFieldTests(TestCase):
+    def test_index_round_trip(self):
+        field = RandomBigIntegerCharField(max_length=3, min_length=1, valid_chars="abc")
+        values = [field.value_from_index(i) for i in range(field.possibilities)]
+        self.assertEqual(values[:4], ["a", "b", "c", "aa"])
+        self.assertEqual(values[-1], "ccc")
+        self.assertEqual(len(set(values)), field.possibilities)
+        for i, value in enumerate(values):
+            self.assertEqual(field.index_from_value(value), i)
+        
+        with self.assertRaises(ValueError):
+            field.value_from_index(field.possibilities)
+        for value in ("", "abcd", "abd"):
+            with self.assertRaises(ValueError):
+                field.index_from_value(value)
+    
+    def test_db_value_bounds(self):
+        field = RandomBigIntegerCharField(max_length=13)
+        self.assertEqual(field.get_prep_value("2222222222222"), field.lower_bound)
+        self.assertLessEqual(field.get_prep_value("ZZZZZZZZZZZZZ"), field.upper_bound)
+        self.assertEqual(field.to_python(field.get_prep_value("Z9Z2222222222")), "Z9Z2222222222")
+        with self.assertRaises(ValueError):
+            field.get_prep_value("abc")
+    
+    def test_field_kwargs(self):
+        with self.assertRaises(ValueError):
+            RandomBigIntegerCharField(max_length=14)
+        with self.assertRaises(ValueError):
+            RandomBigIntegerCharField(max_length=2, valid_chars="aab")
+    
+    def test_checks(self):
+        field = TestBigIntegerChar._meta.get_field("data")
+        self.assertEqual(field.check(), [])
+    
+    def test_save_and_query(self):
+        obj = TestBigIntegerChar.objects.create()
+        self.assertIsInstance(obj.data, text_type)
+        self.assertEqual(len(obj.data), 8)
+        
+        obj = TestBigIntegerChar.objects.get(data=obj.data)
+        self.assertIsInstance(obj.data, text_type)
+        self.assertEqual(list(TestBigIntegerChar.objects.filter(data__in=[obj.data, "22222222"])), [obj])
+        obj.full_clean()
+        
+        with self.assertRaises(IntegrityError):
+            TestBigIntegerChar.objects.create(data=obj.data)
+    
+    def test_all_possibilities(self):
+        while TestBigIntegerCharPossibilities.objects.count() < 6:
+            TestBigIntegerCharPossibilities().save()
+        all_values = TestBigIntegerCharPossibilities.objects.order_by("data").values_list("data", flat=True)
+        self.assertEqual(list(all_values), ["a", "b", "aa", "ab", "ba", "bb"])
+        self.assertRaises(IntegrityError, TestBigIntegerCharPossibilities().save)
+    
+    def test_formfield(self):
+        form_field = RandomBigIntegerCharField(max_length=3, valid_chars="ab").formfield()
+        form_field.clean("aba")
+        for value in ("abc", "ab", "abab"):
+            with self.assertRaises(ValidationError):
+                form_field.clean(value)
+
+
+class TimeSortedCharFieldTests(TestCase):
+    def test_kwargs(self):
+        field = RandomTimeSortedCharField(max_length=8, min_length=7, time_length=4, valid_chars="ba")
+        self.assertEqual(field.time_chars, "ab")
+        self.assertEqual(field.buckets, 2 ** 4)
+        self.assertEqual(field.bucket_possibilities, 2 ** 3 + 2 ** 4)
+        for time_length in (0, 7):
+            with self.assertRaises(ValueError):
+                RandomTimeSortedCharField(max_length=8, min_length=7, time_length=time_length)
+    
+    def test_bucket_prefix(self):
+        field = RandomTimeSortedCharField(max_length=10, time_length=3, valid_chars="ba")
+        self.assertEqual(field.get_bucket_prefix(0), "aaa")
+        self.assertEqual(field.get_bucket_prefix(6), "bba")
+        with mock.patch('time.time', return_value=field.epoch + 6 * 60):
+            value = field.random()
+        self.assertEqual(len(value), 10)
+        self.assertTrue(value.startswith("bba"))
+        # buckets wrap around
+        self.assertEqual(field.get_bucket_prefix(8 % field.buckets), "aaa")
+    
+    def test_values_sort_by_time(self):
+        field = TestTimeSortedChar._meta.get_field("data")
+        values = []
+        for offset in (0, 60, 120, 3600, 86400):
+            with mock.patch('time.time', return_value=field.epoch + offset):
+                values.append(TestTimeSortedChar.objects.create().data)
+        self.assertEqual(values, sorted(values))
+    
+    def test_occupancy_counts_current_bucket(self):
+        field = TestTimeSortedChar._meta.get_field("data")
+        with mock.patch('time.time', return_value=field.epoch):
+            TestTimeSortedChar.objects.create()
+            self.assertEqual(field.get_occupancy(TestTimeSortedChar), (1, 27 ** 5))
+        with mock.patch('time.time', return_value=field.epoch + 60):
+            self.assertEqual(field.get_occupancy(TestTimeSortedChar), (0, 27 ** 5))
+
+
+class PermutationCharFieldTests(TestCase):
+    def setUp(self):
+        TestPermutationChar._meta.get_field("data")._sequence_blocks.clear()
+    
+    def test_kwargs(self):
+        with self.assertRaises(ValueError):
+            RandomCharField(max_length=5, valid_chars="aab", permutation=True)
+        with self.assertRaises(TypeError):
+            RandomTimeSortedCharField(max_length=10, permutation=True)
+    
+    def test_all_possibilities_without_probes(self):
+        with CaptureQueriesContext(connection) as context:
+            values = [TestPermutationChar.objects.create().data for _ in range(6)]
+        self.assertEqual(sorted(values), ["a", "aa", "ab", "b", "ba", "bb"])
+        for query in context.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn(" IN (", query["sql"])
+        # one block of the sequence is reserved for all values
+        reservations = [query for query in context.captured_queries if query["sql"].startswith('INSERT INTO "randomfields_sequence"')]
+        self.assertEqual(len(reservations), 1)
+        
+        with self.assertRaises(IntegrityError):
+            TestPermutationChar.objects.create()
+
+
+class GrowingCharFieldTests(TestCase):
+    def setUp(self):
+        self.field = TestGrowingChar._meta.get_field("data")
+        self.field._min_lengths.clear()
+        self.field._length_counts.clear()
+    
+    def test_kwargs(self):
+        for kwargs in [
+            dict(max_length=3, min_length=3, grow_at_percent=0.5),
+            dict(max_length=3, min_length=1, grow_at_percent=0),
+            dict(max_length=3, min_length=1, grow_at_percent=1),
+            dict(max_length=3, min_length=1, grow_at_percent=0.5, permutation=True),
+        ]:
+            with self.assertRaises(ValueError):
+                RandomCharField(**kwargs)
+        with self.assertRaises(TypeError):
+            RandomBigIntegerCharField(max_length=3, min_length=1, grow_at_percent=0.5)
+    
+    def test_occupancy(self):
+        self.assertEqual(self.field.get_occupancy(TestGrowingChar), (0, 2 + 4 + 8))
+        TestGrowingChar.objects.create(data="aa")
+        self.assertEqual(self.field.get_occupancy(TestGrowingChar), (1, 2 + 4 + 8))
+        TestGrowingChar.objects.create(data="a")
+        # half of the single character values are taken
+        self.assertEqual(self.field.get_occupancy(TestGrowingChar), (1, 4 + 8))
+        self.assertEqual(self.field.get_effective_min_length(), 2)
+        TestGrowingChar.objects.create(data="ab")
+        self.assertEqual(self.field.get_occupancy(TestGrowingChar), (0, 8))
+        self.assertEqual(self.field.get_effective_min_length(), 3)
+    
+    def test_length_counts_are_reused(self):
+        TestGrowingChar.objects.create(data="aa")
+        with CaptureQueriesContext(connection) as context:
+            self.field.get_occupancy(TestGrowingChar)
+            self.field.get_occupancy(TestGrowingChar)
+        # both count the rows but the values by length are only counted once
+        self.assertEqual(len(context.captured_queries), 2 + 2)
+    
+    def test_grows_on_save(self):
+        TestGrowingChar.objects.create(data="a")
+        for _ in range(10):
+            obj = TestGrowingChar.objects.create()
+            self.assertGreaterEqual(len(obj.data), 2)
+            self.assertLessEqual(len(obj.data), 3)
+        self.assertIn(self.field.get_effective_min_length(), (2, 3))
+        self.assertEqual(TestGrowingChar.objects.count(), 11)
+    
+    def test_scopes_grow_on_their_own(self):
+        field = TestScopedGrowingChar._meta.get_field("code")
+        field._min_lengths.clear()
+        field._length_counts.clear()
+        TestScopedGrowingChar.objects.create(tenant=1, code="a")
+        self.assertEqual(field.get_occupancy(TestScopedGrowingChar, (1,)), (0, 4 + 8))
+        self.assertEqual(field.get_occupancy(TestScopedGrowingChar, (2,)), (0, 2 + 4 + 8))
+        self.assertEqual(field.get_effective_min_length((1,)), 2)
+        self.assertEqual(field.get_effective_min_length((2,)), 1)
+        for _ in range(5):
+            self.assertGreaterEqual(len(TestScopedGrowingChar.objects.create(tenant=1).code), 2)
+    
+    def test_scope_state_is_bounded(self):
+        field = TestScopedGrowingChar._meta.get_field("code")
+        field._min_lengths.clear()
+        self.addCleanup(field._min_lengths.clear)
+        for tenant in range(field.max_scopes + 1):
+            field._min_lengths[(tenant,)] = 2
+        self.assertEqual(len(field._min_lengths), field.max_scopes)
+        # the least recently used scope is dropped and starts over
+        self.assertEqual(field.get_effective_min_length((0,)), 1)
+        self.assertEqual(field.get_effective_min_length((field.max_scopes,)), 2)
+
+
+class ScopedCharFieldTests(TestCase):
+    def test_unique_scope(self):
+        field = TestScopedChar._meta.get_field("code")
+        self.assertEqual(field.unique_scope, ([TestScopedChar._meta.get_field("tenant")], None))
+        self.assertEqual(field.get_scope(TestScopedChar(tenant=1)), (1,))
+        self.assertIsNone(TestGrowingChar._meta.get_field("data").unique_scope)
+    
+    def test_values_are_unique_per_scope(self):
+        for tenant in (1, 2):
+            codes = set(TestScopedChar.objects.create(tenant=tenant).code for _ in range(2))
+            self.assertEqual(codes, set(["a", "b"]))
+        with self.assertRaises(IntegrityError):
+            TestScopedChar.objects.create(tenant=1)
+    
+    def test_queries_are_scoped(self):
+        TestScopedChar.objects.create(tenant=1)
+        with CaptureQueriesContext(connection) as context:
+            TestScopedChar.objects.create(tenant=2)
+        selects = [query["sql"] for query in context.captured_queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        for sql in selects:
+            self.assertIn('"tenant" = 2', sql)
+    
+    def test_null_scope_is_not_checked(self):
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(3):
+                TestScopedChar.objects.create(tenant=None)
+        for query in context.captured_queries:
+            self.assertFalse(query["sql"].startswith("SELECT"))
+    
+    @skipIf(UniqueConstraint is None, "UniqueConstraint requires Django 2.2")
+    def test_conditional_constraint(self):
+        field = TestConditionalScopedChar._meta.get_field("code")
+        self.assertEqual(field.unique_scope[1], Q(active=True))
+        for code in "ab":
+            TestConditionalScopedChar.objects.create(tenant=1, active=False, code=code)
+        codes = set(TestConditionalScopedChar.objects.create(tenant=1).code for _ in range(2))
+        self.assertEqual(codes, set(["a", "b"]))
+        with self.assertRaises(IntegrityError):
+            TestConditionalScopedChar.objects.create(tenant=1)
+
+
+class ReplicaRouter(object):
+    def db_for_read(self, model, **hints):
+        return "replica"
+    
+    def db_for_write(self, model, **hints):
+        return "default"
+
+
+class DatabaseRoutingTests(TestCase):
+    def test_base_manager(self):
+        TestSoftDeleteChar.objects.create(data="a", deleted=True)
+        self.assertEqual(TestSoftDeleteChar.objects.create().data, "b")
+        with self.assertRaises(IntegrityError):
+            TestSoftDeleteChar.objects.create()
+    
+    @override_settings(DATABASE_ROUTERS=[ReplicaRouter()])
+    def test_occupancy_database(self):
+        field = TestSoftDeleteChar._meta.get_field("data")
+        self.assertEqual(field.get_occupancy_database(TestSoftDeleteChar, None, "default"), "replica")
+        # saved to a database the router did not pick
+        self.assertEqual(field.get_occupancy_database(TestSoftDeleteChar, None, "other"), "other")
+    
+    def test_save_using(self):
+        field = TestSoftDeleteChar._meta.get_field("data")
+        with mock.patch.object(field, "find_available_values", wraps=field.find_available_values) as mocked:
+            obj = TestSoftDeleteChar()
+            obj.save(using="default")
+        self.assertEqual(mocked.call_args[0], (TestSoftDeleteChar, obj, "default"))
+        self.assertFalse(hasattr(obj, field.using_attname))
+        self.assertEqual(obj._state.db, "default")
+
+
+class ReservationTests(TestCase):
+    def setUp(self):
+        self.field = TestReservedChar._meta.get_field("data")
+        cache.clear()
+    
+    def test_values_are_reserved(self):
+        obj = TestReservedChar.objects.create()
+        self.assertTrue(cache.get(self.field.get_reservation_key(obj.data, "default", ())))
+    
+    def test_reserved_values_are_skipped(self):
+        cache.add(self.field.get_reservation_key("a", "default", ()), 1)
+        for _ in range(3):
+            obj = TestReservedChar()
+            self.field.persist_available_values(obj, set(["a", "b"]))
+            obj.save()
+            self.assertEqual(obj.data, "b")
+            obj.delete()
+            cache.delete(self.field.get_reservation_key("b", "default", ()))
+    
+    def test_reservations_are_bounded(self):
+        for value in "ab":
+            cache.add(self.field.get_reservation_key(value, "default", ()), 1)
+        with mock.patch.object(self.field, "find_available_values", wraps=self.field.find_available_values) as find:
+            with self.assertRaises(IntegrityError):
+                TestReservedChar.objects.create()
+        self.assertEqual(find.call_count, self.field.max_retry)
+    
+    def test_reservation_cache_check(self):
+        field = RandomCharField(name="foo", max_length=1, reservation_cache="missing")
+        field.attname = "foo"
+        field.model = TestReservedChar
+        ids = [error.id for error in field.check()]
+        self.assertIn("randomfields.models.fields.base.RandomFieldMixin.ReservationCacheMissing", ids)
+        self.assertNotIn("randomfields.models.fields.base.RandomFieldMixin.ReservationCacheMissing", [error.id for error in self.field.check()])
+
+class NormalizingLookupTests(TestCase):
+    def test_normalize_value(self):
+        field = RandomCharField(max_length=4)
+        self.assertIsNone(field.normalize_value("b2c"))
+        self.assertEqual(field.normalize_value("B2C"), "B2C")
+        self.assertEqual(field.normalize_value("b2c", ignore_case=True), "B2C")
+        self.assertIsNone(field.normalize_value("BAC", ignore_case=True))
+        self.assertIsNone(field.normalize_value("B2C2B", ignore_case=True))
+        
+        mixed = RandomCharField(max_length=4, valid_chars="aB")
+        self.assertEqual(mixed.normalize_value("AbaB", ignore_case=True), "aBaB")
+        
+        ambiguous = RandomCharField(max_length=4, valid_chars="aA")
+        self.assertIsNone(ambiguous.case_map)
+        self.assertEqual(ambiguous.normalize_value("aA", ignore_case=True), "aA")
+        self.assertIsNone(ambiguous.normalize_value("ab", ignore_case=True))
+    
+    def test_iexact_uses_exact(self):
+        obj = TestStrictLookups.objects.create()
+        value = obj.code.lower()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(TestStrictLookups.objects.get(code__iexact=value), obj)
+        sql = context.captured_queries[0]["sql"]
+        self.assertNotIn("LIKE", sql.upper())
+        self.assertNotIn("UPPER(", sql.upper())
+        self.assertIn(obj.code, sql)
+    
+    def test_invalid_values_skip_query(self):
+        obj = TestStrictLookups.objects.create()
+        with self.assertNumQueries(0):
+            self.assertFalse(TestStrictLookups.objects.filter(code="A" + obj.code[1:]).exists())
+            self.assertFalse(TestStrictLookups.objects.filter(code__iexact="not-a-code").exists())
+            self.assertFalse(TestStrictLookups.objects.filter(code__in=["A", "0" * 11]).exists())
+        self.assertEqual(list(TestStrictLookups.objects.filter(code__in=["A", obj.code])), [obj])
+        self.assertEqual(list(TestStrictLookups.objects.exclude(code="A")), [obj])
+    
+    def test_lookups_find_values_outside_valid_chars(self):
+        # such as rows stored before valid_chars changed
+        obj = TestUnique.objects.create(unique_field="legacy")
+        self.assertEqual(TestUnique.objects.get(unique_field="legacy"), obj)
+        self.assertEqual(TestUnique.objects.get(unique_field__iexact="LEGACY"), obj)
+        self.assertEqual(list(TestUnique.objects.filter(unique_field__in=["legacy"])), [obj])
+    
+    def test_text_field_lookups_are_copied(self):
+        self.assertEqual(RandomTextField.class_lookups, RandomCharField.class_lookups)
+        self.assertIsNot(RandomTextField.class_lookups, RandomCharField.class_lookups)
@@ -0,0 +1,173 @@
+import json
+import logging
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, IntegrityError, connections
+from randomfields.checks import DJANGO_VERSION_LT_20
+from timeit import default_timer
+from .benchmark_saves import benchmark_models
+from ...utils import ensure_tables, environment, get_random_field, prefill
+
+def run_worker(model_cls, using, saves, start):
+    """
+        saves `saves` rows once `start` is released and returns the counts of
+        the worker.  runs in a thread or in a forked process.
+    """
+    table = model_cls._meta.db_table
+    result = {"saves": 0, "attempts": 0, "integrity_errors": 0, "exhausted": 0, "errors": 0}
+
+    def count_insert(execute, sql, params, many, context):
+        if not (sql.startswith("INSERT") and table in sql):
+            return execute(sql, params, many, context)
+        result["attempts"] += 1
+        try:
+            return execute(sql, params, many, context)
+        except IntegrityError:
+            result["integrity_errors"] += 1
+            raise
+
+    start.wait()
+    began = default_timer()
+    try:
+        with connections[using].execute_wrapper(count_insert):
+            for _ in range(saves):
+                try:
+                    model_cls.objects.using(using).create()
+                except IntegrityError:
+                    # save_wrapper ran out of retries
+                    result["exhausted"] += 1
+                except DatabaseError:
+                    # such as sqlite's "database is locked"
+                    result["errors"] += 1
+                else:
+                    result["saves"] += 1
+    finally:
+        connections[using].close()
+    result["elapsed"] = default_timer() - began
+    return result
+
+def get_database(database, sqlite=None):
+    """
+        returns the alias of the database that workers share, the SQLite
+        file `sqlite` if given
+    """
+    using = database
+    if sqlite:
+        using = "benchmark_concurrency"
+        connections.databases[using] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": sqlite,
+            # writers wait for each other instead of failing immediately
+            "OPTIONS": {"timeout": 30},
+        }
+    connection = connections[using]
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        raise CommandError("Workers cannot share an in memory database.  Use --sqlite or a PostgreSQL database.")
+    return using
+
+def run_workers(model_cls, using, workers, saves, mode):
+    """
+        saves `saves` rows in each of `workers` threads or processes and
+        returns the results of the workers and the seconds it took
+    """
+    if mode == "threads":
+        executor = ThreadPoolExecutor(workers)
+        start = threading.Barrier(workers)
+    else:
+        # forked workers must not share the connections of this process
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        if sys.version_info < (3, 7):
+            # backwards compatibility python < 3.7 has no mp_context and
+            # forks by default where fork is available
+            executor = ProcessPoolExecutor(workers)
+        else:
+            executor = ProcessPoolExecutor(workers, mp_context=context)
+        start = context.Manager().Barrier(workers)
+
+    began = default_timer()
+    with executor:
+        futures = [executor.submit(run_worker, model_cls, using, saves, start) for _ in range(workers)]
+        worker_results = [future.result() for future in futures]
+    return worker_results, default_timer() - began
+
+class Command(BaseCommand):
+    help = (
+        "Saves rows of a random field model from several concurrent workers and reports collisions, retries, "
+        "exhausted retries and how throughput scales with the number of workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--field", default="small_integer", choices=sorted(benchmark_models), help="Benchmark model to save.")
+        parser.add_argument("--workers", default="1,2,4,8", help="Comma separated numbers of concurrent workers to measure.")
+        parser.add_argument("--saves", type=int, default=200, help="Number of saves per worker.")
+        parser.add_argument("--fill", type=float, default=0.5, help="Fill ratio of the table before each run.")
+        parser.add_argument("--mode", default="processes", choices=["processes", "threads"], help="Run the workers as processes or threads.")
+        parser.add_argument("--max-retry", type=int, default=None, help="Overrides max_retry of the field.")
+        parser.add_argument("--database", default="default", help="Database alias to save to.  Must not be an in memory database.")
+        parser.add_argument("--sqlite", default=None, help="Path of a SQLite file to use instead of --database.  Created if missing.")
+        parser.add_argument("--output", default=None, help="File to write the JSON results to.")
+
+    def handle(self, *args, **options):
+        if DJANGO_VERSION_LT_20:
+            raise CommandError("Counting queries requires execute_wrapper from Django 2.0 or later.")
+        try:
+            worker_counts = [int(count) for count in options["workers"].split(",")]
+        except ValueError as e:
+            raise CommandError("Invalid --workers: %s" % e)
+        if not 0 <= options["fill"] < 1:
+            raise CommandError("--fill must be in [0, 1).")
+        if options["mode"] == "processes" and "fork" not in multiprocessing.get_all_start_methods():
+            raise CommandError("Process workers require the 'fork' start method.  Use --mode threads.")
+
+        using = get_database(options["database"], options["sqlite"])
+        model_cls = benchmark_models[options["field"]]
+        field = get_random_field(model_cls)
+        ensure_tables(using)
+
+        max_retry = field.max_retry
+        if options["max_retry"] is not None:
+            field.max_retry = options["max_retry"]
+        logger = logging.getLogger("django.randomfields")
+        disabled, logger.disabled = logger.disabled, True
+        try:
+            results = [self.measure(model_cls, using, count, options) for count in worker_counts]
+        finally:
+            field.max_retry = max_retry
+            logger.disabled = disabled
+
+        report = json.dumps({"environment": environment(using), "results": results}, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+    def measure(self, model_cls, using, workers, options):
+        field = get_random_field(model_cls)
+        prefill(model_cls, int(field.possibilities * options["fill"]), using)
+        field._collision_estimates.clear()
+
+        worker_results, elapsed = run_workers(model_cls, using, workers, options["saves"], options["mode"])
+
+        totals = dict((key, sum(result[key] for result in worker_results)) for key in ("saves", "attempts", "integrity_errors", "exhausted", "errors"))
+        result = {
+            "workers": workers,
+            "mode": options["mode"],
+            "field": options["field"],
+            "fill_ratio": options["fill"],
+            "saves": totals["saves"],
+            "exhausted_retries": totals["exhausted"],
+            "database_errors": totals["errors"],
+            "integrity_error_rate": float(totals["integrity_errors"]) / totals["attempts"] if totals["attempts"] else 0.0,
+            # the last IntegrityError of an exhausted save was not retried
+            "retries_per_save": float(totals["integrity_errors"] - totals["exhausted"]) / totals["saves"] if totals["saves"] else None,
+            "saves_per_second": totals["saves"] / elapsed,
+        }
+        self.stderr.write("%3d %s: %8.0f saves/s %6.4f integrity errors/attempt %6.4f retries/save %4d exhausted %4d database errors" % (
+            workers, options["mode"], result["saves_per_second"], result["integrity_error_rate"],
+            result["retries_per_save"] or 0, result["exhausted_retries"], result["database_errors"]))
+        return result
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from randomfields.checks import DJANGO_VERSION_LT_20
+from timeit import default_timer
+from ...models import BenchmarkFixedChar, BenchmarkGrowingChar
+from ...utils import count_queries, ensure_tables
+
+class Command(BaseCommand):
+    help = "Measures insert latency against table size for a RandomCharField with and without 'grow_at_percent'."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Number of rows to insert per model.")
+        parser.add_argument("--step", type=int, default=2000, help="Number of rows per measurement.")
+
+    def handle(self, *args, **options):
+        if DJANGO_VERSION_LT_20:
+            raise CommandError("Counting queries requires execute_wrapper from Django 2.0 or later.")
+        ensure_tables()
+        rows, step = options["rows"], options["step"]
+
+        self.stdout.write("%8s %16s %16s %16s %16s %10s" % (
+            "rows", "fixed ms/insert", "fixed queries", "grow ms/insert", "grow queries", "grow min"))
+        fixed, growing = BenchmarkFixedChar, BenchmarkGrowingChar
+        growing_field = growing._meta.get_field("data")
+        for size in range(step, rows + 1, step):
+            fixed_ms, fixed_queries = self.measure(fixed, step)
+            growing_ms, growing_queries = self.measure(growing, step)
+            self.stdout.write("%8d %16.3f %16.2f %16.3f %16.2f %10d" % (
+                size, fixed_ms, fixed_queries, growing_ms, growing_queries, growing_field.get_effective_min_length()))
+
+    def measure(self, model_cls, count):
+        """
+            inserts `count` rows and returns the mean milliseconds and queries
+            per insert
+        """
+        with count_queries() as queries:
+            start = default_timer()
+            for _ in range(count):
+                model_cls.objects.create()
+            elapsed = default_timer() - start
+        return elapsed * 1000 / count, float(len(queries)) / count
@@ -0,0 +1,57 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+default_modules = ["randomfields", "randomfields.random", "randomfields.models.fields"]
+
+def parse_importtime(output):
+    """
+        returns a dict of module names to the cumulative microseconds that
+        `python -X importtime` reported for them
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+class Command(BaseCommand):
+    help = "Measures the cold import time of randomfields during django.setup() in fresh interpreters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters.  The fastest import is reported.")
+        parser.add_argument("--modules", default=",".join(default_modules), help="Comma separated modules to report.")
+        parser.add_argument("--output", default=None, help="File to write the JSON results to.")
+
+    def handle(self, *args, **options):
+        if sys.version_info < (3, 7):
+            raise CommandError("python -X importtime requires Python 3.7 or later.")
+        modules = options["modules"].split(",")
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        best = {}
+        for _ in range(options["repeat"]):
+            process = subprocess.Popen(
+                [sys.executable, "-X", "importtime", "-c", "import django; django.setup()"],
+                cwd=settings.BASE_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+            )
+            _, stderr = process.communicate()
+            if process.returncode:
+                raise CommandError("django.setup() failed:\n%s" % stderr)
+            times = parse_importtime(stderr)
+            for module in modules:
+                if module in times:
+                    best[module] = min(best.get(module, times[module]), times[module])
+
+        for module in modules:
+            if module in best:
+                self.stdout.write("%-40s %10.1f ms" % (module, best[module] / 1000.0))
+            else:
+                self.stdout.write("%-40s %13s" % (module, "not imported"))
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({"import_time_us": best}, f, indent=2, sort_keys=True)
@@ -0,0 +1,163 @@
+import json
+import pickle
+import string
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from randomfields import random
+from randomfields.models.fields import RandomBigIntegerCharField, RandomCharField, RandomIntegerIdentifierField
+from randomfields.models.fields.integer.identifier import IntegerIdentifier
+from timeit import Timer
+from ...utils import environment
+
+charsets = {
+    "digits": string.digits,
+    "alphanumeric": string.ascii_letters + string.digits,
+    "printable": string.printable,
+}
+
+def make_field(field_cls, **kwargs):
+    field = field_cls(**kwargs)
+    field.set_attributes_from_name("data")
+    return field
+
+def get_benchmarks():
+    """
+        returns a list of (name, callable) pairs timed by the command
+    """
+    benchmarks = [
+        ("random.randint", lambda: random.randint(0, 2 ** 63 - 1)),
+        ("random.choice", lambda: random.choice(string.ascii_letters)),
+    ]
+
+    for length in (8, 32, 128):
+        for charset in sorted(charsets):
+            field = make_field(RandomCharField, max_length=length, valid_chars=charsets[charset])
+            benchmarks.append(("RandomCharField.random[%d,%s]" % (length, charset), field.random))
+
+    identifier_field = make_field(RandomIntegerIdentifierField)
+    a, b = identifier_field.random(), identifier_field.random()
+    identifiers = [identifier_field.random() for _ in range(1000)]
+    pickled = pickle.dumps(a, pickle.HIGHEST_PROTOCOL)
+    args = (a.db_value, a.possibilities, a.lower_bound, a.upper_bound)
+    benchmarks.extend([
+        ("IntegerIdentifier()", lambda: IntegerIdentifier(*args)),
+        ("IntegerIdentifier.__hash__", lambda: hash(a)),
+        ("IntegerIdentifier.__eq__", lambda: a == b),
+        ("IntegerIdentifier.__eq__[int]", lambda: a == args[0]),
+        ("IntegerIdentifier.__lt__", lambda: a < b),
+        ("sorted(IntegerIdentifier[1000])", lambda: sorted(identifiers)),
+        ("pickle.dumps(IntegerIdentifier)", lambda: pickle.dumps(a, pickle.HIGHEST_PROTOCOL)),
+        ("pickle.loads(IntegerIdentifier)", lambda: pickle.loads(pickled)),
+    ])
+
+    db_value = a.db_value
+    big_char_field = make_field(RandomBigIntegerCharField, max_length=8)
+    big_char_value = big_char_field.random()
+    big_char_db_value = big_char_field.get_prep_value(big_char_value)
+    char_field = make_field(RandomCharField, max_length=32)
+    char_value = char_field.random()
+    benchmarks.extend([
+        ("RandomIntegerIdentifierField.to_python", lambda: identifier_field.to_python(db_value)),
+        ("RandomIntegerIdentifierField.get_prep_value", lambda: identifier_field.get_prep_value(a)),
+        ("RandomIntegerIdentifierField.from_db_value", lambda: identifier_field.from_db_value(db_value, None, None)),
+        ("RandomBigIntegerCharField.to_python", lambda: big_char_field.to_python(big_char_db_value)),
+        ("RandomBigIntegerCharField.get_prep_value", lambda: big_char_field.get_prep_value(big_char_value)),
+        ("RandomBigIntegerCharField.from_db_value", lambda: big_char_field.from_db_value(big_char_db_value, None, None)),
+        ("RandomCharField.to_python", lambda: char_field.to_python(char_value)),
+        ("RandomCharField.get_prep_value", lambda: char_field.get_prep_value(char_value)),
+    ])
+    return benchmarks
+
+def get_memory_benchmarks():
+    """
+        returns a list of (name, factory) pairs.  the factory is called with
+        an index and returns the object to measure.
+    """
+    identifier_field = make_field(RandomIntegerIdentifierField)
+    big_char_field = make_field(RandomBigIntegerCharField, max_length=8)
+    char_field = make_field(RandomCharField, max_length=32)
+    return [
+        ("IntegerIdentifier", identifier_field.value_from_index),
+        ("RandomBigIntegerCharField value", big_char_field.value_from_index),
+        ("RandomCharField value[32]", lambda index: char_field.random()),
+    ]
+
+def autorange(timer):
+    """
+        returns the loop count that Timer.autorange() of Python 3.6 picks:
+        the first of 1, 2, 5, 10, 20, 50, ... that takes at least 0.2 seconds
+    """
+    number = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if 0.2 <= timer.timeit(number * multiplier):
+                return number * multiplier
+        number *= 10
+
+def time_call(func, repeat):
+    """
+        returns the best time of `repeat` runs in seconds per call
+    """
+    timer = Timer(func)
+    number = autorange(timer)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def measure_memory(factory, count):
+    """
+        returns the bytes allocated per object when `count` objects made by
+        `factory` are kept alive
+    """
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        objects = [factory(index) for index in range(count)]
+        used = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    # the list holding the objects is not part of their cost
+    used -= objects.__sizeof__()
+    return float(used) / count
+
+class Command(BaseCommand):
+    help = "Times the pure Python hot paths of the random fields and measures the memory used per value."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Number of timing runs.  The best run is reported.")
+        parser.add_argument("--objects", type=int, default=10000, help="Number of objects kept alive to measure the memory per object.")
+        parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this text.")
+        parser.add_argument("--output", default=None, help="File to write the JSON results to.")
+        parser.add_argument("--compare", default=None, help="JSON results of an earlier run to compare against.")
+
+    def handle(self, *args, **options):
+        baseline = {}
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as f:
+                    baseline = json.load(f)
+            except (IOError, ValueError) as e:
+                raise CommandError("Could not read %s: %s" % (options["compare"], e))
+
+        name_filter = options["filter"]
+        timings = {}
+        for name, func in get_benchmarks():
+            if name_filter and name_filter not in name:
+                continue
+            timings[name] = time_call(func, options["repeat"]) * 1e9
+            self.report(name, timings[name], "ns", baseline.get("timings", {}).get(name))
+
+        memory = {}
+        for name, factory in get_memory_benchmarks():
+            if name_filter and name_filter not in name:
+                continue
+            memory[name] = measure_memory(factory, options["objects"])
+            self.report(name, memory[name], "bytes", baseline.get("memory", {}).get(name))
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump({"environment": environment(), "timings": timings, "memory": memory}, f, indent=2, sort_keys=True)
+
+    def report(self, name, value, unit, baseline):
+        line = "%-48s %12.1f %s" % (name, value, unit)
+        if baseline:
+            line += "  %+6.1f%%" % ((value / baseline - 1) * 100)
+        self.stdout.write(line)
@@ -0,0 +1,101 @@
+import json
+import logging
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router
+from randomfields.checks import DJANGO_VERSION_LT_20
+from timeit import default_timer
+from ...models import BenchmarkBoundedInteger, BenchmarkChar, BenchmarkInteger, BenchmarkSmallIdentifier, BenchmarkSmallInteger
+from ...utils import count_queries, ensure_tables, environment, get_random_field, percentile, prefill
+
+benchmark_models = {
+    "bounded_integer": BenchmarkBoundedInteger,
+    "char": BenchmarkChar,
+    "integer": BenchmarkInteger,
+    "small_integer": BenchmarkSmallInteger,
+    "small_identifier": BenchmarkSmallIdentifier,
+}
+
+class Command(BaseCommand):
+    help = "Measures save() throughput of random fields at fill ratios from 0% to 99% and writes the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fields", default=",".join(sorted(benchmark_models)), help="Comma separated benchmarks out of: %s." % ", ".join(sorted(benchmark_models)))
+        parser.add_argument("--ratios", default="0,0.25,0.5,0.75,0.9,0.95,0.99", help="Comma separated fill ratios to measure at.")
+        parser.add_argument("--max-rows", type=int, default=1000000, help="Fill ratios that need more prefilled rows than this are skipped.")
+        parser.add_argument("--inserts", type=int, default=200, help="Number of saves measured per fill ratio.")
+        parser.add_argument("--output", default=None, help="File to write the JSON results to.  Defaults to stdout.")
+
+    def handle(self, *args, **options):
+        if DJANGO_VERSION_LT_20:
+            raise CommandError("Counting queries requires execute_wrapper from Django 2.0 or later.")
+        try:
+            models = [benchmark_models[name] for name in options["fields"].split(",")]
+            ratios = [float(ratio) for ratio in options["ratios"].split(",")]
+        except (KeyError, ValueError) as e:
+            raise CommandError("Invalid --fields or --ratios: %s" % e)
+        if not all(0 <= ratio < 1 for ratio in ratios):
+            raise CommandError("Fill ratios must be in [0, 1).")
+
+        using = router.db_for_write(models[0])
+        ensure_tables(using)
+        results = []
+        for model_cls in models:
+            name = [key for key, value in benchmark_models.items() if value is model_cls][0]
+            possibilities = get_random_field(model_cls).possibilities
+            for ratio in ratios:
+                if options["max_rows"] < int(possibilities * ratio):
+                    self.stderr.write("%-16s %5.1f%% skipped, needs more than %d rows" % (name, ratio * 100, options["max_rows"]))
+                    continue
+                result = self.measure(model_cls, ratio, options["inserts"])
+                result["field"] = name
+                results.append(result)
+                self.stderr.write("%-16s %5.1f%% %10.0f inserts/s %6.2f queries %8.3f ms p50 %8.3f ms p99 %4d retries" % (
+                    name, ratio * 100, result["inserts_per_second"], result["queries_per_insert"],
+                    result["latency_ms"]["p50"], result["latency_ms"]["p99"], result["retries"]))
+
+        report = json.dumps({"environment": environment(using), "results": results}, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+    def measure(self, model_cls, ratio, inserts):
+        """
+            fills the table to `ratio` and returns the metrics of saving up
+            to `inserts` rows
+        """
+        field = get_random_field(model_cls)
+        rows = int(field.possibilities * ratio)
+        prefill(model_cls, rows)
+        inserts = min(inserts, field.possibilities - rows)
+
+        latencies = []
+        # the occupancy warnings of nearly full tables would flood stderr
+        logger = logging.getLogger("django.randomfields")
+        disabled, logger.disabled = logger.disabled, True
+        try:
+            with count_queries() as queries:
+                for _ in range(inserts):
+                    start = default_timer()
+                    model_cls.objects.create()
+                    latencies.append(default_timer() - start)
+        finally:
+            logger.disabled = disabled
+        # every attempt to save runs one INSERT
+        table = model_cls._meta.db_table
+        attempts = len([sql for sql in queries if sql.startswith("INSERT") and table in sql])
+
+        elapsed = sum(latencies)
+        return {
+            "fill_ratio": ratio,
+            "possibilities": field.possibilities,
+            "inserts": inserts,
+            "inserts_per_second": inserts / elapsed if elapsed else None,
+            "queries_per_insert": float(len(queries)) / inserts if inserts else None,
+            "latency_ms": {
+                "p50": percentile(latencies, 0.5) * 1000,
+                "p99": percentile(latencies, 0.99) * 1000,
+            },
+            "retries": attempts - inserts,
+        }
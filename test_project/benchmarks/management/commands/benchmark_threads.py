@@ -0,0 +1,95 @@
+import json
+import logging
+import sys
+import sysconfig
+from django.core.management.base import BaseCommand, CommandError
+from randomfields.checks import DJANGO_VERSION_LT_20
+from .benchmark_concurrency import get_database, run_workers
+from .benchmark_saves import benchmark_models
+from ...utils import ensure_tables, environment, get_random_field, prefill
+
+def gil_status():
+    """
+        returns whether the interpreter was built without the GIL and whether
+        the GIL is enabled at run time
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return {
+        "free_threading_build": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+        "gil_enabled": True if is_gil_enabled is None else is_gil_enabled(),
+    }
+
+class Command(BaseCommand):
+    help = (
+        "Saves rows of the benchmark models from several threads, which runs candidate generation, the caches of "
+        "the fields and the INSERT, and reports how throughput scales with the number of threads and whether the "
+        "GIL is enabled."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fields", default=",".join(sorted(benchmark_models)), help="Comma separated benchmarks out of: %s." % ", ".join(sorted(benchmark_models)))
+        parser.add_argument("--threads", default="1,2,4,8", help="Comma separated numbers of threads to measure.")
+        parser.add_argument("--saves", type=int, default=500, help="Number of saves per thread.")
+        parser.add_argument("--fill", type=float, default=0, help="Fill ratio of the table before each run.")
+        parser.add_argument("--database", default="default", help="Database alias to save to.  Must not be an in memory database.")
+        parser.add_argument("--sqlite", default=None, help="Path of a SQLite file to use instead of --database.  Created if missing.")
+        parser.add_argument("--output", default=None, help="File to write the JSON results to.  Defaults to stdout.")
+
+    def handle(self, *args, **options):
+        if DJANGO_VERSION_LT_20:
+            raise CommandError("Counting queries requires execute_wrapper from Django 2.0 or later.")
+        try:
+            fields = options["fields"].split(",")
+            models = [benchmark_models[name] for name in fields]
+            thread_counts = [int(count) for count in options["threads"].split(",")]
+        except (KeyError, ValueError) as e:
+            raise CommandError("Invalid --fields or --threads: %s" % e)
+        if not all(0 < count for count in thread_counts):
+            raise CommandError("Thread counts must be positive.")
+        if not 0 <= options["fill"] < 1:
+            raise CommandError("--fill must be in [0, 1).")
+
+        using = get_database(options["database"], options["sqlite"])
+        ensure_tables(using)
+        results = []
+        # the occupancy warnings of nearly full tables would flood stderr
+        logger = logging.getLogger("django.randomfields")
+        disabled, logger.disabled = logger.disabled, True
+        try:
+            for name, model_cls in zip(fields, models):
+                single = None
+                for threads in thread_counts:
+                    result = self.measure(model_cls, using, threads, options)
+                    result["field"] = name
+                    # scaling is relative to the first thread count measured
+                    single = single or result["saves_per_second"] / threads
+                    result["scaling"] = result["saves_per_second"] / single if single else None
+                    results.append(result)
+        finally:
+            logger.disabled = disabled
+
+        env = environment(using)
+        env.update(gil_status())
+        report = json.dumps({"environment": env, "results": results}, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(report)
+        else:
+            self.stdout.write(report)
+
+    def measure(self, model_cls, using, threads, options):
+        field = get_random_field(model_cls)
+        prefill(model_cls, int(field.possibilities * options["fill"]), using)
+        field._collision_estimates.clear()
+        worker_results, elapsed = run_workers(model_cls, using, threads, options["saves"], "threads")
+        saves = sum(result["saves"] for result in worker_results)
+        attempts = sum(result["attempts"] for result in worker_results)
+        return {
+            "threads": threads,
+            "saves": saves,
+            "elapsed": elapsed,
+            "saves_per_second": saves / max(result["elapsed"] for result in worker_results),
+            "integrity_error_rate": float(sum(result["integrity_errors"] for result in worker_results)) / attempts if attempts else 0.0,
+            "exhausted_retries": sum(result["exhausted"] for result in worker_results),
+            "database_errors": sum(result["errors"] for result in worker_results),
+        }
@@ -0,0 +1,31 @@
+from django.db import models
+from randomfields.models.fields import RandomCharField, RandomIntegerField, RandomSmallIntegerField, RandomSmallIntegerIdentifierField
+
+# 2 to 5 digits: 111,100 possibilities
+growth_kwargs = dict(unique=True, min_length=2, max_length=5, valid_chars="0123456789")
+
+class BenchmarkFixedChar(models.Model):
+    data = RandomCharField(**growth_kwargs)
+
+class BenchmarkGrowingChar(models.Model):
+    data = RandomCharField(grow_at_percent=0.5, **growth_kwargs)
+
+class BoundedIntegerField(RandomIntegerField):
+    lower_bound = 0
+    upper_bound = 99999
+
+# save throughput at fill ratios, each keyspace but the integer one is small enough to be filled
+class BenchmarkChar(models.Model):
+    data = RandomCharField(unique=True, max_length=5, valid_chars="0123456789")
+
+class BenchmarkInteger(models.Model):
+    data = RandomIntegerField(unique=True)
+
+class BenchmarkBoundedInteger(models.Model):
+    data = BoundedIntegerField(unique=True)
+
+class BenchmarkSmallInteger(models.Model):
+    data = RandomSmallIntegerField(unique=True)
+
+class BenchmarkSmallIdentifier(models.Model):
+    id = RandomSmallIntegerIdentifierField(primary_key=True)
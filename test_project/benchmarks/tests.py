@@ -0,0 +1,146 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import TestCase
+from randomfields.checks import DJANGO_VERSION_LT_20
+from six import StringIO
+from unittest import skipIf, skipUnless
+from .management.commands.benchmark_import import parse_importtime
+from .management.commands.benchmark_micro import measure_memory
+from .models import BenchmarkChar, BenchmarkFixedChar, BenchmarkGrowingChar, BenchmarkInteger
+from .utils import percentile
+
+class BenchmarkCommandTests(TestCase):
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    def test_benchmark_growth(self):
+        out = StringIO()
+        call_command("benchmark_growth", rows=20, step=10, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(BenchmarkFixedChar.objects.count(), 20)
+        self.assertEqual(BenchmarkGrowingChar.objects.count(), 20)
+
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    def test_benchmark_saves(self):
+        out = StringIO()
+        call_command("benchmark_saves", fields="char,small_identifier", ratios="0,0.5", inserts=5, stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertIn("environment", report)
+        results = report["results"]
+        self.assertEqual([(result["field"], result["fill_ratio"]) for result in results], [
+            ("char", 0), ("char", 0.5), ("small_identifier", 0), ("small_identifier", 0.5),
+        ])
+        for result in results:
+            self.assertEqual(result["inserts"], 5)
+            self.assertEqual(result["retries"], 0)
+        self.assertEqual(BenchmarkChar.objects.count(), 50000 + 5)
+
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    def test_benchmark_saves_skips_large_fills(self):
+        out = StringIO()
+        err = StringIO()
+        call_command("benchmark_saves", fields="integer", ratios="0,0.5", inserts=5, stdout=out, stderr=err)
+        results = json.loads(out.getvalue())["results"]
+        self.assertEqual([(result["field"], result["fill_ratio"]) for result in results], [("integer", 0)])
+        self.assertIn("skipped", err.getvalue())
+        self.assertEqual(BenchmarkInteger.objects.count(), 5)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1), 100)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile([3, 1], 0.5), 1)
+
+    def test_benchmark_micro(self):
+        out = StringIO()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, "micro.json")
+        call_command("benchmark_micro", filter="IntegerIdentifier.__hash__", repeat=1, output=output, stdout=out)
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(list(report["timings"]), ["IntegerIdentifier.__hash__"])
+        self.assertEqual(report["memory"], {})
+
+        out = StringIO()
+        call_command("benchmark_micro", filter="IntegerIdentifier.__hash__", repeat=1, compare=output, stdout=out)
+        self.assertIn("%", out.getvalue())
+
+    def test_measure_memory(self):
+        self.assertGreater(measure_memory(lambda index: "x" * 100 + str(index), 100), 100)
+
+    def get_sqlite(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(connections.databases.pop, "benchmark_concurrency")
+        self.addCleanup(connections.__delitem__, "benchmark_concurrency")
+        self.addCleanup(connections.close_all)
+        return os.path.join(directory, "db.sqlite3")
+
+    def run_benchmark_concurrency(self, mode):
+        out = StringIO()
+        call_command(
+            "benchmark_concurrency", sqlite=self.get_sqlite(), mode=mode,
+            workers="1,2", saves=5, fill=0.5, stdout=out, stderr=StringIO(),
+        )
+        results = json.loads(out.getvalue())["results"]
+        self.assertEqual([result["workers"] for result in results], [1, 2])
+        self.assertEqual(results[0]["saves"], 5)
+        for result in results:
+            # sqlite may refuse concurrent writers
+            self.assertEqual(result["mode"], mode)
+            self.assertEqual(result["saves"] + result["exhausted_retries"] + result["database_errors"], 5 * result["workers"])
+
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    def test_benchmark_concurrency_threads(self):
+        self.run_benchmark_concurrency("threads")
+
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    @skipUnless("fork" in multiprocessing.get_all_start_methods(), "Process workers require the 'fork' start method")
+    def test_benchmark_concurrency_processes(self):
+        self.run_benchmark_concurrency("processes")
+
+    def test_benchmark_concurrency_requires_shared_database(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_concurrency", stdout=StringIO())
+
+    @skipIf(sys.version_info < (3, 7), "python -X importtime requires Python 3.7")
+    def test_benchmark_import(self):
+        out = StringIO()
+        call_command("benchmark_import", repeat=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[-1].startswith("randomfields.models.fields"))
+        self.assertTrue(lines[-1].endswith(" ms"))
+
+    @skipIf(DJANGO_VERSION_LT_20, "execute_wrapper requires Django 2.0")
+    def test_benchmark_threads(self):
+        out = StringIO()
+        call_command("benchmark_threads", sqlite=self.get_sqlite(), fields="char", threads="1,2", saves=5, stdout=out)
+        report = json.loads(out.getvalue())
+        self.assertIn("gil_enabled", report["environment"])
+        results = report["results"]
+        self.assertEqual([(result["field"], result["threads"]) for result in results], [("char", 1), ("char", 2)])
+        for result in results:
+            # sqlite may refuse concurrent writers
+            self.assertEqual(result["saves"] + result["exhausted_retries"] + result["database_errors"], 5 * result["threads"])
+        self.assertEqual(results[0]["saves"], 5)
+
+    def test_benchmark_threads_requires_shared_database(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_threads", stdout=StringIO())
+
+    def test_parse_importtime(self):
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       670 |        670 |     randomfields.random",
+            "import time:       293 |      20718 | randomfields.models.fields",
+        ])
+        self.assertEqual(parse_importtime(output), {"randomfields.random": 670, "randomfields.models.fields": 20718})
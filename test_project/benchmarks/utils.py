@@ -0,0 +1,64 @@
+import platform
+from math import ceil
+import random
+from contextlib import contextmanager
+import django
+from django.apps import apps
+from django.db import connections
+
+def ensure_tables(using="default"):
+    """
+        creates the tables of the benchmark models if they do not exist.  the
+        default database of the test project is in memory.
+    """
+    connection = connections[using]
+    tables = connection.introspection.table_names()
+    missing = [model for model in apps.get_app_config("benchmarks").get_models() if model._meta.db_table not in tables]
+    if missing:
+        with connection.schema_editor() as editor:
+            for model in missing:
+                editor.create_model(model)
+
+@contextmanager
+def count_queries(using="default"):
+    """
+        yields a list that collects the SQL of every query run in the block
+    """
+    queries = []
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+    with connections[using].execute_wrapper(count_query):
+        yield queries
+
+def percentile(values, q):
+    """
+        returns the `q` quantile of `values` with the nearest rank method
+    """
+    values = sorted(values)
+    return values[max(0, int(ceil(q * len(values))) - 1)]
+
+def environment(using="default"):
+    connection = connections[using]
+    return {
+        "database": connection.vendor,
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+def get_random_field(model_cls):
+    """
+        returns the random field of a benchmark model
+    """
+    return [field for field in model_cls._meta.local_fields if hasattr(field, "possibilities")][0]
+
+def prefill(model_cls, rows, using="default"):
+    """
+        replaces the rows of `model_cls` with `rows` distinct random values
+    """
+    field = get_random_field(model_cls)
+    manager = model_cls._base_manager.db_manager(using)
+    manager.all().delete()
+    indexes = random.sample(range(field.possibilities), rows)
+    manager.bulk_create([model_cls(**{field.attname: field.value_from_index(index)}) for index in indexes], batch_size=500)
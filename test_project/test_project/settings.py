@@ -43,6 +43,7 @@ INSTALLED_APPS = (
     'randomfields',
     'randomfields.tests',
     'testadmin',
+    'benchmarks',
 )
 
 from randomfields.checks import DJANGO_VERSION_LT_20
@@ -136,6 +137,8 @@ SUPERUSER_USERNAME = "admin"
 SUPERUSER_EMAIL = "admin@example.com"
 SUPERUSER_PASSWORD = "admin"
 
+RANDOMFIELDS_PERMUTATION_KEY = 'not-so-secret-permutation-key'
+
 SILENCED_SYSTEM_CHECKS = [
     "randomfields.models.fields.integer.identifier.RandomIntegerIdentifierFieldMixin.Unsupported",
     "randomfields.models.fields.base.RandomFieldMixin.MaskedAttr",
@@ -8,9 +8,16 @@ except ImportError:
     # backwards compatibility Django < 2.0
     # https://docs.djangoproject.com/en/2.0/releases/2.0/#features-removed-in-2-0
     from django.core.urlresolvers import reverse
+from django.db import models
 from django.test import TestCase
+try:
+    from django.test.utils import isolate_apps
+except ImportError:
+    # backwards compatibility Django < 1.10
+    isolate_apps = None
 from randomfields.checks import DJANGO_VERSION_17
 from randomfields.models.fields import RandomCharField, RandomBigIntegerField
+from randomfields.models.fields.base import get_model_attribute_names
 from randomfields.tests import mock
 from randomfields.tests.models import TestNPIFieldChecks, TestMaskedAttrDetection, TestIdentifierM2MO2OPKValue, TestIdentifierM2MFKValue, TestIdentifierValue, TestIdentifierO2OValue, TestIdentifierFKValue, TestIdentifierM2MValue, TestIdentifierAllValue, TestIdentifierM2MO2OValue
 from unittest import skipIf
@@ -39,6 +46,26 @@ class AppTestConfigTests(TestCase):
 
     def test_masked_attrs(self):
         self._test_system_check(TestMaskedAttrDetection, "randomfields.models.fields.base.RandomFieldMixin.MaskedAttr")
+
+    @skipIf(isolate_apps is None, "isolate_apps requires Django 1.10")
+    def test_masked_attrs_inherited(self):
+        class MaskingMixin(object):
+            _randomfields_using = None
+        
+        with isolate_apps("randomfields.tests"):
+            class TestInheritedMaskedAttr(MaskingMixin, models.Model):
+                data = RandomCharField(max_length=10)
+            
+            self._test_system_check(TestInheritedMaskedAttr, "randomfields.models.fields.base.RandomFieldMixin.MaskedAttr")
+    
+    def test_masked_attrs_without_instance(self):
+        with mock.patch.object(TestIdentifierValue, "__init__", side_effect=AssertionError("instantiated")):
+            self._test_system_check(TestIdentifierValue, "randomfields.models.fields.base.RandomFieldMixin.MaskedAttr", False)
+    
+    def test_model_attribute_names_cached(self):
+        names = get_model_attribute_names(TestIdentifierValue)
+        self.assertIn("save", names)
+        self.assertIs(get_model_attribute_names(TestIdentifierValue), names)
     
     def test_narrow_positive_integer_field_depreciated(self):
         self._test_system_check(TestNPIFieldChecks, "randomfields.models.fields.integer.base.NarrowPositiveIntegerField.Depreciated")